@@ -0,0 +1,20 @@
+"""
+Optional Numba JIT for small per-frame kernels.
+
+``njit`` is numba.njit when numba is installed
+(pip install schallpappenspieler[jit]); otherwise it returns the function
+unchanged and the kernels run as plain Python.
+"""
+
+try:
+    from numba import njit  # type: ignore
+except ImportError:
+    HAVE_NUMBA = False
+
+    def njit(*args, **kwargs):
+        if len(args) == 1 and callable(args[0]) and not kwargs:
+            return args[0]
+        return lambda fn: fn
+
+else:
+    HAVE_NUMBA = True
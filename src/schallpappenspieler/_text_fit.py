@@ -0,0 +1,127 @@
+"""
+Word-wrap fitting on prefix sums of glyph widths.
+
+reportlab measures a string as the sum of its glyphs' integer font units
+times 0.001 * size. Summing the units of the joined words once gives every
+candidate line's width as a difference of two prefix sums, with the same
+float result as canvas.stringWidth. The fitting loop is compiled when numba
+is installed; without it the kernel is fed plain lists, which index faster
+than NumPy arrays in interpreted code.
+"""
+
+from functools import lru_cache
+from itertools import accumulate
+
+import numpy as np
+from reportlab.pdfbase import pdfmetrics
+
+from ._jit import HAVE_NUMBA, njit
+
+# Line kinds in fit_words results: whole words, or one word too wide alone.
+LINE_WORDS = 0
+LINE_OVERLONG = 1
+
+
+@lru_cache(maxsize=4096)
+def _glyph_units(font_name: str, char: str) -> int:
+    # Type 1 metrics are whole font units; round away the 0.001 * 1000 error.
+    return round(pdfmetrics.stringWidth(char, font_name, 1000))
+
+
+def prefix_units(text: str, font_name: str) -> list[int]:
+    """Glyph units of every prefix of text; element k is text[:k]'s width."""
+    return list(accumulate((_glyph_units(font_name, ch) for ch in text), initial=0))
+
+
+@lru_cache(maxsize=4096)
+def text_width(text: str, font_name: str, font_size: float) -> float:
+    """canvas.stringWidth(text) for that font, memoized."""
+    return sum(_glyph_units(font_name, ch) for ch in text) * 0.001 * font_size
+
+
+def _kernel_array(values, dtype):
+    return np.fromiter(values, dtype) if HAVE_NUMBA else list(values)
+
+
+def fit_words(
+    words: list[str],
+    font_name: str,
+    font_size: float,
+    max_widths: list[float],
+    max_lines: int,
+) -> tuple[str, list[tuple[int, int, int]], int]:
+    """
+    Greedily fill up to max_lines lines with words.
+
+    Returns (joined, lines, next_word): joined is the words separated by
+    single spaces, each line is (kind, start, end) as a slice of joined, and
+    next_word is the first word that was not placed.
+    """
+    joined = " ".join(words)
+    cum = _kernel_array(prefix_units(joined, font_name), np.int64)
+    word_starts = []
+    word_ends = []
+    pos = 0
+    for word in words:
+        word_starts.append(pos)
+        pos += len(word)
+        word_ends.append(pos)
+        pos += 1
+    first_word, last_word, kinds, count, next_word = _fit_lines(
+        cum,
+        _kernel_array(word_starts, np.int64),
+        _kernel_array(word_ends, np.int64),
+        _kernel_array(max_widths, np.float64),
+        max_lines,
+        float(font_size),
+    )
+    lines = [
+        (int(kinds[i]), word_starts[first_word[i]], word_ends[last_word[i]])
+        for i in range(count)
+    ]
+    return joined, lines, int(next_word)
+
+
+@njit(cache=True)
+def _fit_lines(cum, word_starts, word_ends, max_widths, max_lines, font_size):
+    """
+    Line breaking on prefix sums; line i holds words first_word[i]..last_word[i].
+
+    Returns (first_word, last_word, kinds, count, next_word).
+    """
+    n = len(word_starts)
+    first_word = np.empty(max_lines, np.int64)
+    last_word = np.empty(max_lines, np.int64)
+    kinds = np.empty(max_lines, np.int64)
+    count = 0
+    current = -1  # first word of the line being filled, -1 while empty
+    word_index = 0
+    while word_index < n and count < max_lines:
+        width = max_widths[count] if count < len(max_widths) else 0.0
+        if width <= 0:
+            break
+        start = word_starts[word_index] if current < 0 else word_starts[current]
+        units = cum[word_ends[word_index]] - cum[start]
+        if units * 0.001 * font_size <= width:
+            if current < 0:
+                current = word_index
+            word_index += 1
+            continue
+        if current >= 0:
+            first_word[count] = current
+            last_word[count] = word_index - 1
+            kinds[count] = LINE_WORDS
+            count += 1
+            current = -1
+            continue
+        first_word[count] = word_index
+        last_word[count] = word_index
+        kinds[count] = LINE_OVERLONG
+        count += 1
+        word_index += 1
+    if count < max_lines and current >= 0:
+        first_word[count] = current
+        last_word[count] = word_index - 1
+        kinds[count] = LINE_WORDS
+        count += 1
+    return first_word, last_word, kinds, count, word_index
@@ -1,11 +1,106 @@
 """Camera capture configuration and initialization."""
 
+import sys
+import threading
+import time
+from dataclasses import dataclass
+
 import cv2
 
+# grab() calls that return faster than this were served from the driver's
+# queue rather than waiting for the sensor, i.e. the frame is already stale.
+_STALE_GRAB_SECONDS = 0.002
+# Upper bound on consecutive fast grabs, for drivers that never block.
+_MAX_DRAIN_GRABS = 8
+
+_FOURCC_MJPG = cv2.VideoWriter_fourcc(*"MJPG")
+_FOURCC_YUY2 = cv2.VideoWriter_fourcc(*"YUY2")
+
+
+@dataclass(frozen=True)
+class CameraMode:
+    """Capture mode the driver actually accepted, read back once at open time."""
+
+    width: int
+    height: int
+    fps: float
+    fourcc: str
+
+
+class FreshestFrameCapture:
+    """
+    Keep only the newest frame of a VideoCapture.
+
+    CAP_PROP_BUFFERSIZE is ignored by many V4L2/DirectShow drivers, so frames
+    queue up inside the driver and every read() returns an old image. A daemon
+    thread calls grab() in a tight loop (cheap, no decode) and only retrieve()s
+    when read() asks for a frame, so decode cost is paid for the freshest one.
+
+    read() is meant to be called from a single consumer thread.
+    """
+
+    def __init__(self, cap: cv2.VideoCapture, mode: CameraMode) -> None:
+        self._cap = cap
+        self.mode = mode
+        self._wanted = threading.Event()
+        self._ready = threading.Event()
+        self._stop = threading.Event()
+        self._result = (False, None)
+        self._dst = None
+        self._thread = threading.Thread(target=self._run, daemon=True)
+        self._thread.start()
+
+    def _run(self) -> None:
+        drained = 0
+        while not self._stop.is_set():
+            t0 = time.perf_counter()
+            if not self._cap.grab():
+                time.sleep(0.01)
+                continue
+            stale = time.perf_counter() - t0 < _STALE_GRAB_SECONDS
+            if stale and drained < _MAX_DRAIN_GRABS:
+                # Buffered frame; drain the backlog without decoding it.
+                drained += 1
+                continue
+            drained = 0
+            if self._wanted.is_set():
+                self._wanted.clear()
+                self._result = self._cap.retrieve(self._dst)
+                self._ready.set()
+
+    def read(self, dst=None, timeout: float = 1.0):
+        """
+        Decode the next fresh frame.
+
+        Args:
+            dst: Optional preallocated array to decode into; reused by
+                OpenCV when its shape and dtype match the frame.
+
+        Returns:
+            (ok, frame) like cv2.VideoCapture.read()
+        """
+        self._dst = dst
+        self._ready.clear()
+        self._wanted.set()
+        if not self._ready.wait(timeout):
+            self._wanted.clear()
+            return False, None
+        return self._result
+
+    def release(self) -> None:
+        """Stop the grab thread. The underlying capture is left open."""
+        self._stop.set()
+        self._thread.join(timeout=1.0)
+
+
+def _fourcc_to_str(code: float) -> str:
+    value = int(code)
+    return "".join(chr((value >> (8 * i)) & 0xFF) for i in range(4))
+
 
 def open_camera(
     index: int, preferred_width: int, preferred_height: int
-) -> cv2.VideoCapture:
+) -> tuple[cv2.VideoCapture, FreshestFrameCapture]:
     """
     Open and configure a camera device for high-speed capture.
 
@@ -15,30 +110,59 @@ def open_camera(
         preferred_height: Desired frame height (0 = auto-select max)
 
     Returns:
-        Configured VideoCapture object ready for threaded reading
+        Configured VideoCapture object and a FreshestFrameCapture reading from it.
+        The negotiated mode is available as ``reader.mode``.
 
     Note:
+        - Prefers the V4L2 backend on Linux, falling back to OpenCV's default
         - Uses MJPG compression to achieve 30 FPS on USB 2.0 webcams
+        - Falls back to YUY2 only if the driver rejects MJPG
         - Buffer size is minimized (1 frame) to reduce latency
         - Uncompressed YUYV format typically caps at 1-2 FPS at 1080p
+        - Drivers that ignore the buffer size are handled by FreshestFrameCapture
     """
-    cap = cv2.VideoCapture(index)
+    cap = None
+    if sys.platform.startswith("linux"):
+        # Talk to V4L2 directly rather than whatever backend OpenCV would
+        # probe first (e.g. GStreamer), which may ignore FOURCC/buffer size.
+        cap = cv2.VideoCapture(index, cv2.CAP_V4L2)
+        if not cap.isOpened():
+            cap = None
+    if cap is None:
+        cap = cv2.VideoCapture(index)
     if not cap.isOpened():
         raise RuntimeError(f"Failed to open camera index {index}")
 
     # Use MJPG format — uncompressed YUYV at high resolution often caps at 1-2 FPS
     # on USB 2.0 webcams. MJPG unlocks 30 FPS at 1080p.
-    cap.set(cv2.CAP_PROP_FOURCC, cv2.VideoWriter_fourcc(*"MJPG"))
+    cap.set(cv2.CAP_PROP_FOURCC, _FOURCC_MJPG)
+    is_mjpg = int(cap.get(cv2.CAP_PROP_FOURCC)) == _FOURCC_MJPG
+    if not is_mjpg:
+        print("Camera rejected MJPG; falling back to YUY2.")
+        cap.set(cv2.CAP_PROP_FOURCC, _FOURCC_YUY2)
 
     if preferred_width and preferred_height:
         cap.set(cv2.CAP_PROP_FRAME_WIDTH, preferred_width)
         cap.set(cv2.CAP_PROP_FRAME_HEIGHT, preferred_height)
-    else:
+    elif is_mjpg:
         # Ask for a very large size so the driver picks the highest available.
         cap.set(cv2.CAP_PROP_FRAME_WIDTH, 10000)
         cap.set(cv2.CAP_PROP_FRAME_HEIGHT, 10000)
+    else:
+        # Uncompressed frames: USB 2.0 only sustains 30 FPS at about 640x480.
+        cap.set(cv2.CAP_PROP_FRAME_WIDTH, 640)
+        cap.set(cv2.CAP_PROP_FRAME_HEIGHT, 480)
 
     cap.set(cv2.CAP_PROP_FPS, 30)
     # Minimize internal buffer to reduce latency in threaded capture
     cap.set(cv2.CAP_PROP_BUFFERSIZE, 1)
-    return cap
+
+    # Each get() is a driver ioctl; read the result back once and keep it.
+    mode = CameraMode(
+        width=int(cap.get(cv2.CAP_PROP_FRAME_WIDTH)),
+        height=int(cap.get(cv2.CAP_PROP_FRAME_HEIGHT)),
+        fps=cap.get(cv2.CAP_PROP_FPS),
+        fourcc=_fourcc_to_str(cap.get(cv2.CAP_PROP_FOURCC)),
+    )
+    print(f"Camera mode: {mode.width}x{mode.height} @ {mode.fps:.0f} {mode.fourcc}")
+    return cap, FreshestFrameCapture(cap, mode)
@@ -1,5 +1,18 @@
+import re
 import tomllib
 from pathlib import Path
+from types import MappingProxyType
+from typing import Any, Mapping
+
+# KEY=VALUE lines, one scan over the whole file. Leading whitespace, blanks
+# around the first "=" and trailing whitespace are dropped; "#" lines never
+# match; values are taken verbatim (no inline comments).
+_ENV_LINE = re.compile(
+    r"^[^\S\n]*+(?!#)([^=\n]*?)[^\S\n]*=[^\S\n]*(.*?)[^\S\n]*$", re.MULTILINE
+)
+
+# Resolved path -> (mtime_ns, parsed config), so unchanged files are not re-parsed.
+_cache: dict[Path, tuple[int, Mapping[str, Any]]] = {}
 
 
 def load_env(path: str | Path = ".env") -> dict[str, str]:
@@ -7,26 +20,40 @@ def load_env(path: str | Path = ".env") -> dict[str, str]:
     if not env_path.exists():
         return {}
     env: dict[str, str] = {}
-    with env_path.open("r", encoding="utf-8") as f:
-        for raw_line in f:
-            line = raw_line.strip()
-            if not line or line.startswith("#"):
-                continue
-            if "=" not in line:
-                continue
-            key, value = line.split("=", 1)
-            key = key.strip()
-            value = value.strip()
-            if len(value) >= 2 and value[0] == value[-1] and value[0] in ("'", '"'):
-                value = value[1:-1]
-            if key:
-                env[key] = value
+    for match in _ENV_LINE.finditer(env_path.read_text(encoding="utf-8")):
+        key, value = match.groups()
+        if len(value) >= 2 and value[0] == value[-1] and value[0] in ("'", '"'):
+            value = value[1:-1]
+        if key:
+            env[key] = value
     return env
 
 
-def load_config(path: str) -> dict:
+def _freeze(value):
+    if isinstance(value, dict):
+        return MappingProxyType({k: _freeze(v) for k, v in value.items()})
+    if isinstance(value, list):
+        return tuple(_freeze(v) for v in value)
+    return value
+
+
+def load_config(path: str) -> Mapping[str, Any]:
+    """
+    Load a TOML config, re-parsing only when the file's mtime changes.
+
+    The result is shared between callers, so it is returned read-only
+    (tables as mappingproxy, arrays as tuples).
+    """
     config_path = Path(path)
-    if not config_path.exists():
-        raise FileNotFoundError(f"Config not found: {config_path}")
+    try:
+        mtime = config_path.stat().st_mtime_ns
+    except FileNotFoundError:
+        raise FileNotFoundError(f"Config not found: {config_path}") from None
+    key = config_path.resolve()
+    cached = _cache.get(key)
+    if cached is not None and cached[0] == mtime:
+        return cached[1]
     with config_path.open("rb") as f:
-        return tomllib.load(f)
+        config = _freeze(tomllib.load(f))
+    _cache[key] = (mtime, config)
+    return config
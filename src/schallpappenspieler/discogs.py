@@ -1,8 +1,38 @@
+import asyncio
+import random
+import sqlite3
+import threading
 import time
+from collections import OrderedDict
 from dataclasses import dataclass
-from typing import Optional
+from pathlib import Path
+from typing import Iterable, Optional
 
 import requests
+from requests.adapters import HTTPAdapter
+from urllib3.util import Retry
+
+_SEARCH_URL = "https://api.discogs.com/database/search"
+_MAX_CONCURRENCY = 64
+_MAX_RETRIES = 5
+_RETRY_STATUSES = frozenset({429, 500, 502, 503, 504})
+_POOL_MAXSIZE = 32
+
+DEFAULT_CACHE_PATH = Path.home() / ".cache" / "schallpappenspieler" / "discogs.sqlite"
+_CACHE_TTL_SECONDS = 30 * 24 * 3600
+_CACHE_MEMORY_ENTRIES = 4096
+# Returned by the network path when retries ran out; never cached.
+_NO_ANSWER = object()
+
+
+def _require_aiohttp():
+    try:
+        import aiohttp  # type: ignore
+    except ImportError as exc:
+        raise RuntimeError(
+            "aiohttp is not installed; pip install schallpappenspieler[async]"
+        ) from exc
+    return aiohttp
 
 
 @dataclass
@@ -12,17 +42,136 @@ class DiscogsRateLimit:
     remaining: Optional[int]
 
 
+class _TokenBucket:
+    """Client-side limiter so searches stay under the per-minute quota."""
+
+    def __init__(self, capacity: int = 60):
+        self._lock = threading.Lock()
+        self.capacity = float(capacity)
+        self.tokens = float(capacity)
+        self.refill_rate = self.capacity / 60.0
+        self.last_refill = time.monotonic()
+
+    def set_capacity(self, capacity: int) -> None:
+        with self._lock:
+            self.capacity = float(capacity)
+            self.refill_rate = self.capacity / 60.0
+            self.tokens = min(self.tokens, self.capacity)
+
+    def reserve(self) -> float:
+        """Take one token and return how long the caller must wait first."""
+        with self._lock:
+            now = time.monotonic()
+            elapsed = now - self.last_refill
+            self.tokens = min(self.capacity, self.tokens + elapsed * self.refill_rate)
+            self.last_refill = now
+            self.tokens -= 1.0
+            if self.tokens >= 0:
+                return 0.0
+            return -self.tokens / self.refill_rate
+
+    def acquire(self) -> None:
+        wait_seconds = self.reserve()
+        if wait_seconds > 0:
+            time.sleep(wait_seconds)
+
+
+class _CoverCache:
+    """In-memory LRU in front of a SQLite table of (track, artist) -> cover URL."""
+
+    def __init__(self, path: Optional[Path]):
+        self._lock = threading.Lock()
+        self._memory: OrderedDict[str, Optional[str]] = OrderedDict()
+        self._db: Optional[sqlite3.Connection] = None
+        if path is None:
+            return
+        try:
+            path.parent.mkdir(parents=True, exist_ok=True)
+            db = sqlite3.connect(str(path), check_same_thread=False)
+            db.execute("PRAGMA journal_mode=WAL")
+            db.execute(
+                "CREATE TABLE IF NOT EXISTS covers "
+                "(key TEXT PRIMARY KEY, cover_url TEXT, ts INTEGER)"
+            )
+            db.commit()
+        except (OSError, sqlite3.Error) as exc:
+            print(f"Discogs cache disabled ({path}): {exc}")
+            return
+        self._db = db
+
+    @staticmethod
+    def key(track: str, artist: Optional[str]) -> str:
+        return f"{track.strip().lower()}\x1f{(artist or '').strip().lower()}"
+
+    def _remember(self, key: str, cover_url: Optional[str]) -> None:
+        self._memory[key] = cover_url
+        self._memory.move_to_end(key)
+        if len(self._memory) > _CACHE_MEMORY_ENTRIES:
+            self._memory.popitem(last=False)
+
+    def get(self, key: str):
+        """Return the cached cover URL (may be None), or _NO_ANSWER on a miss."""
+        with self._lock:
+            if key in self._memory:
+                self._memory.move_to_end(key)
+                return self._memory[key]
+            if self._db is None:
+                return _NO_ANSWER
+            row = self._db.execute(
+                "SELECT cover_url, ts FROM covers WHERE key = ?", (key,)
+            ).fetchone()
+            if row is None or time.time() - row[1] > _CACHE_TTL_SECONDS:
+                return _NO_ANSWER
+            self._remember(key, row[0])
+            return row[0]
+
+    def put(self, key: str, cover_url: Optional[str]) -> None:
+        with self._lock:
+            self._remember(key, cover_url)
+            if self._db is None:
+                return
+            self._db.execute(
+                "INSERT OR REPLACE INTO covers (key, cover_url, ts) VALUES (?, ?, ?)",
+                (key, cover_url, int(time.time())),
+            )
+            self._db.commit()
+
+
 class DiscogsClient:
-    def __init__(self, token: str, user_agent: str):
+    def __init__(
+        self,
+        token: str,
+        user_agent: str,
+        cache_path: Optional[str | Path] = DEFAULT_CACHE_PATH,
+    ):
         self._token = token
+        self._headers = {
+            "Authorization": f"Discogs token={token}",
+            "User-Agent": user_agent,
+        }
         self._session = requests.Session()
-        self._session.headers.update(
-            {
-                "Authorization": f"Discogs token={token}",
-                "User-Agent": user_agent,
-            }
+        self._session.headers.update(self._headers)
+        # Explicit so the JSON stays compressed even if defaults change.
+        self._session.headers["Accept-Encoding"] = "gzip, deflate"
+        # urllib3 retries connection errors and retryable statuses with
+        # exponential backoff (honouring Retry-After) on a kept-alive pool.
+        retry = Retry(
+            total=_MAX_RETRIES,
+            backoff_factor=0.5,
+            status_forcelist=_RETRY_STATUSES,
+            raise_on_status=False,
+        )
+        self._session.mount(
+            "https://",
+            HTTPAdapter(
+                pool_connections=4, pool_maxsize=_POOL_MAXSIZE, max_retries=retry
+            ),
         )
         self.last_rate: Optional[DiscogsRateLimit] = None
+        self._bucket = _TokenBucket()
+        self._aio_session = None
+        self._aio_semaphore: Optional[asyncio.Semaphore] = None
+        self._cache = _CoverCache(Path(cache_path).expanduser() if cache_path else None)
 
     def _update_rate(self, headers) -> DiscogsRateLimit:
         def _to_int(value):
@@ -37,6 +186,8 @@ class DiscogsClient:
             remaining=_to_int(headers.get("X-Discogs-Ratelimit-Remaining")),
         )
         self.last_rate = rate
+        if rate.limit and rate.limit != self._bucket.capacity:
+            self._bucket.set_capacity(rate.limit)
         return rate
 
     def wait_if_limited(self) -> int:
@@ -48,7 +199,8 @@ class DiscogsClient:
         time.sleep(sleep_seconds)
         return sleep_seconds
 
-    def search_cover(self, track: str, artist: Optional[str]) -> Optional[str]:
+    @staticmethod
+    def _search_params(track: str, artist: Optional[str]) -> dict:
         params = {
             "track": track,
             "type": "release",
@@ -56,28 +208,118 @@ class DiscogsClient:
         }
         if artist:
             params["artist"] = artist
+        return params
+
+    @staticmethod
+    def _retry_delay(attempt: int, retry_after: Optional[str] = None) -> float:
+        """Capped exponential backoff with full jitter, never below Retry-After."""
+        delay = min(60, 2**attempt) * random.random()
+        try:
+            return max(float(retry_after), delay) if retry_after else delay
+        except ValueError:
+            return delay
+
+    @staticmethod
+    def _first_cover(data: dict) -> Optional[str]:
+        results = data.get("results", [])
+        if not results:
+            return None
+        return results[0].get("cover_image")
+
+    def search_cover(self, track: str, artist: Optional[str]) -> Optional[str]:
+        key = self._cache.key(track, artist)
+        cover_url = self._cache.get(key)
+        if cover_url is _NO_ANSWER:
+            cover_url = self._fetch_cover(track, artist)
+            if cover_url is _NO_ANSWER:
+                return None
+            self._cache.put(key, cover_url)
+        return cover_url
 
-        max_retries = 2
-        for attempt in range(max_retries + 1):
-            resp = self._session.get(
-                "https://api.discogs.com/database/search",
-                params=params,
-                timeout=15,
+    def _fetch_cover(self, track: str, artist: Optional[str]):
+        self._bucket.acquire()
+        resp = self._session.get(
+            _SEARCH_URL, params=self._search_params(track, artist), timeout=15
+        )
+        self._update_rate(resp.headers)
+        if resp.status_code == 429:
+            # Still limited after the adapter's retries; don't cache this.
+            return _NO_ANSWER
+        resp.raise_for_status()
+        return self._first_cover(resp.json())
+
+    def _ensure_aio_session(self):
+        aiohttp = _require_aiohttp()
+        if self._aio_session is None or self._aio_session.closed:
+            self._aio_session = aiohttp.ClientSession(
+                headers=self._headers,
+                connector=aiohttp.TCPConnector(limit_per_host=_MAX_CONCURRENCY),
+                timeout=aiohttp.ClientTimeout(total=15),
             )
-            self._update_rate(resp.headers)
-            if resp.status_code == 429:
-                retry_after = resp.headers.get("Retry-After")
+            self._aio_semaphore = asyncio.Semaphore(_MAX_CONCURRENCY)
+        return self._aio_session
+
+    async def search_cover_async(
+        self, track: str, artist: Optional[str]
+    ) -> Optional[str]:
+        """
+        Async variant of search_cover sharing one aiohttp session.
+
+        Concurrent calls are capped by a semaphore and by the same token bucket
+        as the blocking path, and answered from the same cache. Call aclose()
+        when done.
+        """
+        key = self._cache.key(track, artist)
+        cover_url = self._cache.get(key)
+        if cover_url is not _NO_ANSWER:
+            return cover_url
+
+        aiohttp = _require_aiohttp()
+        session = self._ensure_aio_session()
+        params = self._search_params(track, artist)
+
+        for attempt in range(_MAX_RETRIES + 1):
+            last_attempt = attempt == _MAX_RETRIES
+            async with self._aio_semaphore:
+                wait_seconds = self._bucket.reserve()
+                if wait_seconds > 0:
+                    await asyncio.sleep(wait_seconds)
                 try:
-                    wait_seconds = int(retry_after) if retry_after else 60
-                except ValueError:
-                    wait_seconds = 60
-                time.sleep(wait_seconds)
-                continue
-            resp.raise_for_status()
-
-            data = resp.json()
-            results = data.get("results", [])
-            if not results:
-                return None
-            return results[0].get("cover_image")
+                    async with session.get(_SEARCH_URL, params=params) as resp:
+                        self._update_rate(resp.headers)
+                        if resp.status in _RETRY_STATUSES and not last_attempt:
+                            retry_after = resp.headers.get("Retry-After")
+                            delay = self._retry_delay(attempt, retry_after)
+                        elif resp.status == 429:
+                            return None
+                        else:
+                            resp.raise_for_status()
+                            cover_url = self._first_cover(await resp.json())
+                            self._cache.put(key, cover_url)
+                            return cover_url
+                except (aiohttp.ClientConnectionError, asyncio.TimeoutError):
+                    if last_attempt:
+                        raise
+                    delay = self._retry_delay(attempt)
+            await asyncio.sleep(delay)
         return None
+
+    async def aclose(self) -> None:
+        if self._aio_session is not None:
+            await self._aio_session.close()
+            self._aio_session = None
+
+    def search_covers(
+        self, queries: Iterable[tuple[str, Optional[str]]]
+    ) -> list[Optional[str]]:
+        """Look up many (track, artist) pairs concurrently; results keep order."""
+
+        async def _run() -> list[Optional[str]]:
+            try:
+                return await asyncio.gather(
+                    *(self.search_cover_async(t, a) for t, a in queries)
+                )
+            finally:
+                await self.aclose()
+
+        return asyncio.run(_run())
@@ -15,7 +15,10 @@ Controls:
 - Press 'q' to quit
 """
 
+import multiprocessing
+import queue
 import time
+from multiprocessing import shared_memory
 from typing import Iterable, Optional
 
 import cv2
@@ -24,11 +27,54 @@ import numpy as np
 from .qr_detector import QRCodeDetection
 from .state_tracker import SideState
 
+# Half the button border thickness: how far the outline reaches past its rect.
+_BUTTON_PAD = 4
+# While the overlay is unchanged, the camera image is still refreshed this often.
+_STATIC_REFRESH_SECONDS = 0.1
+# Non-blocking event poll; missing before OpenCV 4.5.
+_poll_key = getattr(cv2, "pollKey", None)
+
+
+class _Sprite:
+    """Small pre-rasterized overlay, alpha-blended onto frames in one call."""
+
+    def __init__(self, width: int, height: int, draw) -> None:
+        color = np.zeros((height, width, 3), np.uint8)
+        alpha = np.zeros((height, width), np.uint8)
+        # draw(canvas, fixed_color): fixed_color is None for the color layer
+        # and 255 for the coverage mask.
+        draw(color, None)
+        draw(alpha, 255)
+        self._weight = (alpha / 255.0).astype(np.float32)
+        # Antialiased edges on the black canvas are premultiplied; undo that
+        # so blending with the coverage weight doesn't darken them twice.
+        covered = alpha > 0
+        color[covered] = np.minimum(
+            color[covered] / self._weight[covered, None] + 0.5, 255
+        ).astype(np.uint8)
+        self.color = color
+        self._keep = 1.0 - self._weight
+
+    def blit(self, frame, x: int, y: int) -> None:
+        sh, sw = self.color.shape[:2]
+        fh, fw = frame.shape[:2]
+        x1, y1 = max(x, 0), max(y, 0)
+        x2, y2 = min(x + sw, fw), min(y + sh, fh)
+        if x2 <= x1 or y2 <= y1:
+            return
+        src = (slice(y1 - y, y2 - y), slice(x1 - x, x2 - x))
+        region = frame[y1:y2, x1:x2]
+        region[...] = cv2.blendLinear(
+            region, self.color[src], self._keep[src], self._weight[src]
+        )
+
 
 class DebugGUI:
     """Interactive debug visualization with ROI selection and performance overlay."""
 
-    def __init__(self, roi_sink=None):
+    def __init__(
+        self, roi_sink=None, target_fps: float = 30.0, use_opencl: bool = False
+    ):
         self.neon = (57, 255, 20)
         self.red = (0, 0, 255)
         self.window_name = "Schallpappenspieler"
@@ -41,6 +87,24 @@ class DebugGUI:
         self._button_rect = None
         self._frame_size = (1, 1)  # (w, h) of last rendered frame
         self._window_size = (1, 1)  # (w, h) of display window
+        # getWindowImageRect is a window-system round trip; re-check sparsely.
+        self._rect_check_interval = 0.5
+        self._rect_last_check = 0.0
+        self._window_ok = False
+        self._button_sprites: dict[str, _Sprite] = {}
+        # Overlays are drawn on this reused copy, never on the caller's frame.
+        self._canvas: Optional[np.ndarray] = None
+        # Monitors refresh at ~60 Hz; presenting faster than this only burns CPU.
+        self._target_gui_interval = 1.0 / target_fps if target_fps > 0 else 0.0
+        self._last_imshow = 0.0
+        self._last_render_key = None
+        # Draw overlays through OpenCV's T-API (cv2.UMat) so they can run on an
+        # OpenCL device instead of the main thread's CPU time.
+        self._use_opencl = use_opencl and cv2.ocl.haveOpenCL()
+        if use_opencl and not self._use_opencl:
+            print("OpenCL not available; drawing debug overlays on the CPU.")
+        if self._use_opencl:
+            cv2.ocl.setUseOpenCL(True)
         cv2.namedWindow(self.window_name, cv2.WINDOW_NORMAL)
         cv2.setMouseCallback(self.window_name, self._on_mouse)
 
@@ -102,7 +166,7 @@ class DebugGUI:
         Render frame with overlays and display in window.
 
         Args:
-            frame: Camera frame to draw on (will be modified)
+            frame: Camera frame; left untouched (may be a read-only view)
             detections: List of detected QR codes
             split_x: X coordinate of deck split line
             left_state: Current state for left deck
@@ -113,10 +177,84 @@ class DebugGUI:
 
         Returns:
             True to continue, False if user quit
+
+        Frames arriving faster than target_fps are not drawn; only events are
+        polled for them. The same goes for frames whose overlay would look
+        exactly like the last one shown, until _STATIC_REFRESH_SECONDS pass.
         """
         if now is None:
             now = time.monotonic()
+        if now - self._last_imshow < self._target_gui_interval:
+            return self.process_events()
+
+        # Work out everything the overlay will show before touching pixels,
+        # so an unchanged overlay can skip the copy, drawing and imshow.
         height, width = frame.shape[:2]
+        button_label = "ROI SET" if self._roi else "ROI"
+        if self._roi_mode:
+            button_label = "ROI..."
+        drag = None
+        if self._dragging and self._drag_start and self._drag_current:
+            drag = (self._drag_start, self._drag_current)
+
+        detections = list(detections)
+        outlines = []
+        labels = []
+        if detections:
+            # One int32 conversion for all outlines and label anchors instead
+            # of per-point Python tuples.
+            outlines = [np.asarray(det.points, dtype=np.int32) for det in detections]
+            anchors = np.asarray([det.center for det in detections], dtype=np.int32)
+            for det, (ax, ay) in zip(detections, anchors.tolist()):
+                side_state = left_state if ax < split_x else right_state
+                first_seen = side_state.first_seen
+                last_seen = side_state.last_seen
+                stable = (now - first_seen) if first_seen else 0.0
+                dropout = (now - last_seen) if last_seen else 0.0
+                labels.append((f"{det.text} {stable:.1f}s/{dropout:.1f}s", (ax, ay)))
+
+        def _timers(state: SideState) -> str:
+            if state.current_text is None:
+                return "stable=0.0s dropout=0.0s"
+            stable = (now - state.first_seen) if state.first_seen else 0.0
+            dropout = (now - state.last_seen) if state.last_seen else 0.0
+            return f"stable={stable:.1f}s dropout={dropout:.1f}s"
+
+        status_lines = (
+            f"Left: {left_state.current_text or '-'} ({_timers(left_state)})",
+            f"Right: {right_state.current_text or '-'} ({_timers(right_state)})",
+            f"Last action: {last_action or '-'}",
+        )
+        perf_line = None
+        if perf_stats is not None:
+            cap_fps, det_fps, det_ms, gui_fps = perf_stats.snapshot()
+            perf_line = (
+                f"CAP {cap_fps:.0f}fps | "
+                f"DET {det_fps:.0f}fps {det_ms:.0f}ms | "
+                f"GUI {gui_fps:.0f}fps"
+            )
+
+        render_key = (
+            frame.shape,
+            split_x,
+            button_label,
+            self._roi,
+            drag,
+            tuple(outline.tobytes() for outline in outlines),
+            tuple(labels),
+            status_lines,
+            perf_line,
+        )
+        if (
+            render_key == self._last_render_key
+            and now - self._last_imshow < _STATIC_REFRESH_SECONDS
+        ):
+            return self.process_events()
+
+        if self._canvas is None or self._canvas.shape != frame.shape:
+            self._canvas = np.empty_like(frame)
+        np.copyto(self._canvas, frame)
+        frame = self._canvas
         self._frame_size = (width, height)
         cv2.line(frame, (split_x, 0), (split_x, height), self.neon, 8)
         # ROI button
@@ -126,60 +264,40 @@ class DebugGUI:
         bx2 = bx1 + button_w
         by2 = by1 + button_h
         self._button_rect = (bx1, by1, bx2, by2)
-        cv2.rectangle(frame, (bx1, by1), (bx2, by2), self.red, 8)
-        label = "ROI SET" if self._roi else "ROI"
-        if self._roi_mode:
-            label = "ROI..."
-        cv2.putText(
-            frame,
-            label,
-            (bx1 + 6, by1 + 19),
-            cv2.FONT_HERSHEY_SIMPLEX,
-            1,
-            self.red,
-            4,
-            cv2.LINE_AA,
-        )
+        sprite = self._button_sprites.get(button_label)
+        if sprite is None:
+            sprite = self._button_sprites[button_label] = self._build_button(
+                button_label, button_w, button_h
+            )
+        sprite.blit(frame, bx1 - _BUTTON_PAD, by1 - _BUTTON_PAD)
+        # Sprite blits slice the ndarray, so upload only after them.
+        if self._use_opencl:
+            frame = cv2.UMat(frame)
 
         # Draw ROI rectangle
         if self._roi:
             x1, y1, x2, y2 = self._roi
             cv2.rectangle(frame, (x1, y1), (x2, y2), self.red, 8)
-        if self._dragging and self._drag_start and self._drag_current:
-            x1, y1 = self._drag_start
-            x2, y2 = self._drag_current
-            cv2.rectangle(frame, (x1, y1), (x2, y2), self.red, 4)
-
-        for det in detections:
-            pts = [(int(x), int(y)) for x, y in det.points]
-            cv2.polylines(frame, [np.array(pts, dtype="int32")], True, self.neon, 8)
-            side_state = left_state if det.center[0] < split_x else right_state
-            stable = (now - side_state.first_seen) if side_state.first_seen else 0.0
-            dropout = (now - side_state.last_seen) if side_state.last_seen else 0.0
-            label = f"{det.text} {stable:.1f}s/{dropout:.1f}s"
+        if drag:
+            cv2.rectangle(frame, drag[0], drag[1], self.red, 4)
+
+        if outlines:
+            # drawContours matches closed polylines pixel for pixel and, unlike
+            # polylines, also accepts a UMat target.
+            cv2.drawContours(frame, outlines, -1, self.neon, 8)
+        for label, anchor in labels:
+            # Labels move with the code every frame; AA edges aren't visible.
             cv2.putText(
                 frame,
                 label,
-                (int(det.center[0]), int(det.center[1])),
+                anchor,
                 cv2.FONT_HERSHEY_SIMPLEX,
                 1,
                 self.neon,
                 4,
-                cv2.LINE_AA,
+                cv2.LINE_8,
             )
 
-        def _timers(state: SideState) -> str:
-            if state.current_text is None:
-                return "stable=0.0s dropout=0.0s"
-            stable = (now - state.first_seen) if state.first_seen else 0.0
-            dropout = (now - state.last_seen) if state.last_seen else 0.0
-            return f"stable={stable:.1f}s dropout={dropout:.1f}s"
-
-        status_lines = [
-            f"Left: {left_state.current_text or '-'} ({_timers(left_state)})",
-            f"Right: {right_state.current_text or '-'} ({_timers(right_state)})",
-            f"Last action: {last_action or '-'}",
-        ]
         y = 20
         for line in status_lines:
             cv2.putText(
@@ -194,13 +312,8 @@ class DebugGUI:
             )
             y += 48
 
-        if perf_stats is not None:
-            cap_fps, det_fps, det_ms, gui_fps = perf_stats.snapshot()
-            perf_line = (
-                f"CAP {cap_fps:.0f}fps | "
-                f"DET {det_fps:.0f}fps {det_ms:.0f}ms | "
-                f"GUI {gui_fps:.0f}fps"
-            )
+        if perf_line is not None:
+            # Numbers change every redraw; not worth antialiasing.
             cv2.putText(
                 frame,
                 perf_line,
@@ -209,28 +322,63 @@ class DebugGUI:
                 1.2,
                 self.neon,
                 8,
-                cv2.LINE_AA,
+                cv2.LINE_8,
             )
 
         try:
             visible = cv2.getWindowProperty(self.window_name, cv2.WND_PROP_VISIBLE)
             if visible < 0:
                 return False
-            render_ok = True
-            try:
-                _, _, w, h = cv2.getWindowImageRect(self.window_name)
-                if w > 0 and h > 0:
-                    self._window_size = (w, h)
-                else:
-                    render_ok = False
-            except cv2.error:
-                render_ok = False
-            if render_ok:
+            # Visibility is still checked every frame: imshow on a closed
+            # window would silently recreate it.
+            if now - self._rect_last_check > self._rect_check_interval:
+                self._rect_last_check = now
+                try:
+                    _, _, w, h = cv2.getWindowImageRect(self.window_name)
+                    self._window_ok = w > 0 and h > 0
+                    if self._window_ok:
+                        self._window_size = (w, h)
+                except cv2.error:
+                    self._window_ok = False
+            if self._window_ok:
                 cv2.imshow(self.window_name, frame)
-            return self._handle_key()
+                self._last_imshow = now
+                self._last_render_key = render_key
+            return self._handle_key(wait=False)
         except cv2.error:
             return True
 
+    def _build_button(self, label: str, button_w: int, button_h: int) -> _Sprite:
+        """Rasterize the ROI button outline and label once per label text."""
+        pad = _BUTTON_PAD
+        (text_w, _), baseline = cv2.getTextSize(label, cv2.FONT_HERSHEY_SIMPLEX, 1, 4)
+        width = pad + max(button_w + pad + 1, 6 + text_w + pad)
+        height = pad + max(button_h + pad + 1, 19 + baseline + pad)
+
+        def draw(canvas, fixed) -> None:
+            cv2.rectangle(
+                canvas,
+                (pad, pad),
+                (pad + button_w, pad + button_h),
+                fixed or self.red,
+                8,
+            )
+            cv2.putText(
+                canvas,
+                label,
+                (pad + 6, pad + 19),
+                cv2.FONT_HERSHEY_SIMPLEX,
+                1,
+                fixed or self.red,
+                4,
+                cv2.LINE_AA,
+            )
+
+        return _Sprite(width, height, draw)
+
+    def close(self) -> None:
+        cv2.destroyWindow(self.window_name)
+
     def process_events(self) -> bool:
         """
         Poll keyboard/mouse events without rendering a frame.
@@ -246,9 +394,18 @@ class DebugGUI:
         except cv2.error:
             return True
 
-    def _handle_key(self) -> bool:
-        """Handle keyboard input. Returns False if user pressed 'q' to quit."""
-        key = cv2.waitKey(1) & 0xFF
+    def _handle_key(self, wait: bool = True) -> bool:
+        """
+        Handle keyboard input. Returns False if user pressed 'q' to quit.
+
+        After a redraw wait=False polls without sleeping (cv2.pollKey, OpenCV
+        4.5+). process_events keeps waitKey(1), whose 1 ms sleep is what paces
+        the main loop while no new frame is available.
+        """
+        if wait or _poll_key is None:
+            key = cv2.waitKey(1) & 0xFF
+        else:
+            key = _poll_key() & 0xFF
         if key == ord("r"):
             self._roi_mode = True
             self._dragging = False
@@ -260,3 +417,153 @@ class DebugGUI:
             if self._roi_sink:
                 self._roi_sink.update(None)
         return key != ord("q")
+
+
+class _QueueSink:
+    """ROI sink in the GUI process that forwards updates to the parent."""
+
+    def __init__(self, events) -> None:
+        self._events = events
+
+    def update(self, roi) -> None:
+        self._events.put(("roi", roi))
+
+
+class _PerfSnapshot:
+    """Stand-in for _PerfStats carrying one snapshot across the process gap."""
+
+    def __init__(self, values) -> None:
+        self._values = values
+
+    def snapshot(self):
+        return self._values
+
+
+def _gui_process_main(frames, events, ready, gui_kwargs) -> None:
+    gui = DebugGUI(roi_sink=_QueueSink(events), **gui_kwargs)
+    shm = None
+    view = None
+    try:
+        while True:
+            try:
+                msg = frames.get(timeout=0.005)
+            except queue.Empty:
+                if not gui.process_events():
+                    break
+                continue
+            if msg is None:
+                break
+            name, shape, args, perf = msg
+            if shm is None or shm.name != name:
+                if shm is not None:
+                    shm.close()
+                shm = shared_memory.SharedMemory(name=name)
+                view = np.ndarray(shape, np.uint8, buffer=shm.buf)
+            perf_stats = _PerfSnapshot(perf) if perf is not None else None
+            keep_running = gui.render(view, *args, perf_stats=perf_stats)
+            ready.set()
+            if not keep_running:
+                break
+    finally:
+        events.put(("quit", None))
+        view = None
+        if shm is not None:
+            shm.close()
+        cv2.destroyAllWindows()
+
+
+class DebugGUIProcess:
+    """
+    DebugGUI hosted in a child process, with the same render/process_events API.
+
+    Drawing and imshow run outside this interpreter, so they no longer hold
+    the GIL against the capture and detection threads. Frames go through a
+    SharedMemory buffer; only detections and deck state are pickled. A frame
+    is written only after the child has finished drawing the previous one,
+    frames arriving while it is busy are dropped.
+    """
+
+    def __init__(self, roi_sink=None, **gui_kwargs) -> None:
+        ctx = multiprocessing.get_context("spawn")
+        self._roi_sink = roi_sink
+        self._frames = ctx.Queue(maxsize=1)
+        self._events = ctx.Queue()
+        self._ready = ctx.Event()
+        self._ready.set()
+        self._shm: Optional[shared_memory.SharedMemory] = None
+        self._buffer = None
+        self._alive = True
+        self._process = ctx.Process(
+            target=_gui_process_main,
+            args=(self._frames, self._events, self._ready, gui_kwargs),
+            daemon=True,
+        )
+        self._process.start()
+
+    def _drain_events(self) -> bool:
+        while True:
+            try:
+                kind, value = self._events.get_nowait()
+            except queue.Empty:
+                break
+            if kind == "quit":
+                self._alive = False
+            elif kind == "roi" and self._roi_sink:
+                self._roi_sink.update(value)
+        return self._alive and self._process.is_alive()
+
+    def _frame_buffer(self, shape) -> np.ndarray:
+        if self._buffer is None or self._buffer.shape != shape:
+            self._release_buffer()
+            size = int(np.prod(shape))
+            self._shm = shared_memory.SharedMemory(create=True, size=size)
+            self._buffer = np.ndarray(shape, np.uint8, buffer=self._shm.buf)
+        return self._buffer
+
+    def _release_buffer(self) -> None:
+        self._buffer = None
+        if self._shm is not None:
+            self._shm.close()
+            self._shm.unlink()
+            self._shm = None
+
+    def render(
+        self,
+        frame,
+        detections: Iterable[QRCodeDetection],
+        split_x: int,
+        left_state: SideState,
+        right_state: SideState,
+        last_action: Optional[str],
+        now: Optional[float] = None,
+        perf_stats=None,
+    ) -> bool:
+        """Hand the frame to the GUI process if it is idle. See DebugGUI.render."""
+        if not self._drain_events():
+            return False
+        if not self._ready.is_set():
+            return True
+        self._ready.clear()
+        np.copyto(self._frame_buffer(frame.shape), frame)
+        if now is None:
+            now = time.monotonic()
+        perf = perf_stats.snapshot() if perf_stats is not None else None
+        args = (list(detections), split_x, left_state, right_state, last_action, now)
+        self._frames.put((self._shm.name, frame.shape, args, perf))
+        return True
+
+    def process_events(self) -> bool:
+        # The child pumps its own window; only pace the caller like waitKey(1).
+        time.sleep(0.001)
+        return self._drain_events()
+
+    def close(self) -> None:
+        if self._process.is_alive():
+            try:
+                self._frames.put(None, timeout=0.5)
+            except queue.Full:
+                pass
+            self._process.join(timeout=2.0)
+            if self._process.is_alive():
+                self._process.terminate()
+        self._release_buffer()
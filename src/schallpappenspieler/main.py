@@ -19,12 +19,14 @@ import threading
 import time
 
 import cv2
+import numpy as np
 
+from ._jit import HAVE_NUMBA, njit
 from .camera import open_camera
 from .config import load_config
-from .gui_debug import DebugGUI
+from .gui_debug import DebugGUI, DebugGUIProcess
 from .mixxx_ui import MixxxConfig, MixxxController
-from .qr_detector import QRDetector
+from .qr_detector import BACKENDS, QRDetector
 from .state_tracker import StateTracker
 
 
@@ -36,103 +38,179 @@ class _FPSCounter:
         self._last_time = time.monotonic()
         self.fps = 0.0
 
-    def tick(self):
+    def tick(self) -> bool:
+        """Count a frame; return True when ``fps`` was just recomputed."""
         self._count += 1
         now = time.monotonic()
         elapsed = now - self._last_time
-        if elapsed >= 1.0:
-            self.fps = self._count / elapsed
-            self._count = 0
-            self._last_time = now
+        if elapsed < 1.0:
+            return False
+        self.fps = self._count / elapsed
+        self._count = 0
+        self._last_time = now
+        return True
 
 
 class _PerfStats:
-    """Thread-safe container for performance metrics across pipeline stages."""
+    """
+    Performance metrics across pipeline stages, readable from any thread.
+
+    Lock-free: each field has exactly one writer thread (capture, detection,
+    main), and attribute stores are atomic under the GIL. A snapshot may mix
+    values from different moments, which is fine for an FPS overlay.
+    """
 
     def __init__(self):
-        self._lock = threading.Lock()
         self.capture_fps = 0.0
-        self.detect_fps = 0.0
-        self.detect_latency_ms = 0.0
+        self._detect = (0.0, 0.0)  # (fps, latency_ms), published together
         self.gui_fps = 0.0
 
     def update_capture(self, fps):
-        with self._lock:
-            self.capture_fps = fps
+        self.capture_fps = fps
 
     def update_detect(self, fps, latency_ms):
-        with self._lock:
-            self.detect_fps = fps
-            self.detect_latency_ms = latency_ms
+        self._detect = (fps, latency_ms)
 
     def update_gui(self, fps):
-        with self._lock:
-            self.gui_fps = fps
+        self.gui_fps = fps
 
     def snapshot(self):
-        with self._lock:
-            return (
-                self.capture_fps,
-                self.detect_fps,
-                self.detect_latency_ms,
-                self.gui_fps,
-            )
+        detect_fps, detect_latency_ms = self._detect
+        return (self.capture_fps, detect_fps, detect_latency_ms, self.gui_fps)
 
 
 class _LatestROI:
-    """Thread-safe storage for GUI-selected region of interest (ROI)."""
+    """GUI-selected region of interest (ROI); a single atomically swapped ref."""
 
     def __init__(self) -> None:
-        self._lock = threading.Lock()
         self._roi = None
 
     def update(self, roi) -> None:
-        with self._lock:
-            self._roi = roi
+        self._roi = roi
 
     def snapshot(self):
-        with self._lock:
-            return self._roi
+        return self._roi
+
+
+# Reader ids for _LatestFrame; each reader thread owns one pin.
+_READER_DETECTION = 0
+_READER_GUI = 1
 
 
 class _LatestFrame:
-    """Thread-safe storage for latest captured frame with version tracking."""
+    """
+    Ring of preallocated frame buffers shared by capture, detection and GUI.
 
-    def __init__(self) -> None:
-        self._lock = threading.Lock()
-        self._frame = None
-        self._version = 0
+    The capture thread writes into a free slot and publishes it; readers pin
+    the latest slot while they use it, so a frame is never overwritten under
+    a reader and no per-frame arrays are allocated. One slot per reader
+    (detection, GUI) plus the latest plus the one being written is enough
+    for the writer to always find a free slot.
 
-    def update(self, frame) -> None:
-        with self._lock:
-            self._frame = frame
-            self._version += 1
+    Each slot holds the BGR frame (GUI) and its grayscale version, which the
+    capture thread converts once so detection reads 1 byte per pixel.
 
-    def snapshot(self):
-        with self._lock:
-            return self._frame, self._version
+    No locks on the data path: there is a single writer, the published state
+    is one tuple swapped atomically, and each reader only ever writes its own
+    pin (hazard-pointer style, see acquire()). A Condition only wakes readers
+    waiting in wait_newer().
+    """
+
+    _SLOTS = 4
+
+    def __init__(self) -> None:
+        self._ring = None  # writer-only
+        self._gray_ring = None  # writer-only
+        self._pins = [-1, -1]  # slot pinned by each reader id, -1 = none
+        # (read-only BGR views, read-only gray views, latest slot, version)
+        self._state: tuple[list[np.ndarray], list[np.ndarray], int, int] = (
+            [],
+            [],
+            -1,
+            0,
+        )
+        self._published = threading.Condition()
+
+    def claim(self, shape, dtype) -> tuple[int, np.ndarray, np.ndarray]:
+        """Return a slot index and its BGR and gray buffers, unused by readers."""
+        views, gray_views, latest, version = self._state
+        if self._ring is None or self._ring.shape[1:] != shape:
+            # First frame or mode change: readers keep their old arrays.
+            self._ring = np.empty((self._SLOTS, *shape), dtype)
+            self._gray_ring = np.empty((self._SLOTS, *shape[:2]), dtype)
+            # Readers get read-only views; only claim() hands out writable ones.
+            views = [slot.view() for slot in self._ring]
+            gray_views = [slot.view() for slot in self._gray_ring]
+            for view in views + gray_views:
+                view.setflags(write=False)
+            self._state = (views, gray_views, -1, version)
+            latest = -1
+        for idx in range(self._SLOTS):
+            if idx != latest and idx not in self._pins:
+                return idx, self._ring[idx], self._gray_ring[idx]
+        raise RuntimeError("No free frame slot; too many concurrent readers")
+
+    def publish(self, idx: int) -> None:
+        views, gray_views, _, version = self._state
+        self._state = (views, gray_views, idx, version + 1)
+        with self._published:
+            self._published.notify_all()
+
+    def wait_newer(self, version: int, timeout: float) -> bool:
+        """Block until a frame newer than version is published or timeout."""
+        with self._published:
+            return self._published.wait_for(lambda: self._state[3] != version, timeout)
+
+    def acquire(self, reader: int, gray: bool = False):
+        """
+        Pin the latest frame for reader (_READER_DETECTION or _READER_GUI).
+
+        Returns:
+            (frame, version); call release(reader) when done. frame is a
+            read-only view (grayscale if gray), or None until the first
+            publish.
+        """
+        while True:
+            state = self._state
+            views, gray_views, idx, version = state
+            if idx < 0:
+                return None, version
+            self._pins[reader] = idx
+            # If nothing was published in between, the writer saw our pin
+            # before it could pick this slot again.
+            if self._state is state:
+                return (gray_views if gray else views)[idx], version
+
+    def release(self, reader: int) -> None:
+        self._pins[reader] = -1
 
 
 class _LatestDetections:
-    """Thread-safe storage for latest QR detections with version tracking."""
+    """
+    Latest QR detections with version tracking; one atomically swapped tuple.
+
+    Besides the detection objects (for drawing) the producer publishes the
+    center x coordinates and areas as arrays, so the main loop can split and
+    pick per deck without touching the objects.
+    """
 
     def __init__(self) -> None:
-        self._lock = threading.Lock()
-        self._detections = []
-        self._version = 0
+        empty = np.empty(0, np.float64)
+        self._state = ([], empty, empty, 0)
 
     def update(self, detections, version: int) -> None:
-        with self._lock:
-            self._detections = detections
-            self._version = version
+        count = len(detections)
+        centers_x = np.fromiter((d.center[0] for d in detections), np.float64, count)
+        areas = np.fromiter((d.area for d in detections), np.float64, count)
+        self._state = (detections, centers_x, areas, version)
 
     def snapshot(self):
-        with self._lock:
-            return self._detections, self._version
+        """Return (detections, centers_x, areas, version)."""
+        return self._state
 
 
 def _start_capture_thread(
-    cap,
+    reader,
     latest: _LatestFrame,
     stats: _PerfStats,
     stop: threading.Event,
@@ -143,21 +221,29 @@ def _start_capture_thread(
     Start camera capture thread that continuously reads frames.
 
     The mirror parameter horizontally flips frames so left in image = left in reality.
-    Runs at full camera speed (typically 30 FPS with MJPG format).
+    Runs at full camera speed (typically 30 FPS with MJPG format). Frames come from
+    a FreshestFrameCapture, so stale frames queued by the driver are skipped.
     """
 
     def run() -> None:
         fps = _FPSCounter()
+        # Decode target reused across frames; the ring slot gets the final copy.
+        scratch = None
         while not stop.is_set():
-            ok, frame = cap.read()
+            ok, frame = reader.read(scratch)
             if not ok:
                 time.sleep(0.01)
                 continue
+            scratch = frame
+            idx, slot, gray = latest.claim(frame.shape, frame.dtype)
             if mirror:
-                frame = cv2.flip(frame, 1)
-            latest.update(frame)
-            fps.tick()
-            stats.update_capture(fps.fps)
+                cv2.flip(frame, 1, dst=slot)
+            else:
+                np.copyto(slot, frame)
+            cv2.cvtColor(slot, cv2.COLOR_BGR2GRAY, dst=gray)
+            latest.publish(idx)
+            if fps.tick():
+                stats.update_capture(fps.fps)
 
     thread = threading.Thread(target=run, daemon=True)
     thread.start()
@@ -171,45 +257,94 @@ def _start_detection_thread(
     roi: _LatestROI,
     stats: _PerfStats,
     stop: threading.Event,
+    *,
+    track_frames: int = 0,
 ) -> threading.Thread:
     """
     Start QR detection thread that processes latest frames.
 
     Polls for new frame versions, applies optional ROI cropping, runs detection,
     and adjusts coordinates back to full-frame space. Measures per-frame latency.
+
+    With track_frames set, frames after a full scan are only searched in a
+    square twice the side of each code found last time, for up to track_frames
+    frames. A full scan runs when any tracked code is lost, and after that many
+    frames so newly placed codes are picked up.
     """
+    tracked: list[tuple[float, float, float]] = []  # (cx, cy, roi side)
+
+    def detect(image, x0: int = 0, y0: int = 0):
+        detections = detector.detect(image)
+        if x0 or y0:
+            for det in detections:
+                det.points = [(x + x0, y + y0) for x, y in det.points]
+                det.center = (det.center[0] + x0, det.center[1] + y0)
+        return detections
+
+    def scan(frame):
+        roi_rect = roi.snapshot()
+        if roi_rect:
+            x1, y1, x2, y2 = roi_rect
+            h, w = frame.shape[:2]
+            x1 = max(0, min(x1, w - 1))
+            x2 = max(0, min(x2, w - 1))
+            y1 = max(0, min(y1, h - 1))
+            y2 = max(0, min(y2, h - 1))
+            if x2 > x1 and y2 > y1:
+                # The pinned slot can't change under us; detect on the
+                # view instead of copying the crop while holding the GIL.
+                return detect(frame[y1:y2, x1:x2], x1, y1)
+        return detect(frame)
+
+    def rescan(frame):
+        """Detect around each tracked code; None as soon as one is missing."""
+        found = []
+        for i, (cx, cy, side) in enumerate(tracked):
+            hits = []
+            for det in detector.detect_roi(frame, cx, cy, side):
+                # Neighbouring squares can overlap; each code belongs to the
+                # square it is nearest to.
+                x, y = det.center
+                nearest = min(
+                    range(len(tracked)),
+                    key=lambda j: (tracked[j][0] - x) ** 2 + (tracked[j][1] - y) ** 2,
+                )
+                if nearest == i:
+                    hits.append(det)
+            if not hits:
+                return None
+            found.extend(hits)
+        return found
 
     def run() -> None:
+        nonlocal tracked
         last_seen = -1
+        tracked_run = 0
         fps = _FPSCounter()
         while not stop.is_set():
-            frame, version = latest.snapshot()
+            frame, version = latest.acquire(_READER_DETECTION, gray=True)
             if frame is None or version == last_seen:
-                time.sleep(0.005)
+                latest.release(_READER_DETECTION)
+                latest.wait_newer(version, timeout=0.1)
                 continue
             last_seen = version
-            roi_rect = roi.snapshot()
             t0 = time.monotonic()
-            if roi_rect:
-                x1, y1, x2, y2 = roi_rect
-                h, w = frame.shape[:2]
-                x1 = max(0, min(x1, w - 1))
-                x2 = max(0, min(x2, w - 1))
-                y1 = max(0, min(y1, h - 1))
-                y2 = max(0, min(y2, h - 1))
-                if x2 > x1 and y2 > y1:
-                    crop = frame[y1:y2, x1:x2].copy()
-                    detections = detector.detect(crop)
-                    for det in detections:
-                        det.points = [(x + x1, y + y1) for x, y in det.points]
-                        det.center = (det.center[0] + x1, det.center[1] + y1)
-                else:
-                    detections = detector.detect(frame)
-            else:
-                detections = detector.detect(frame)
+            detections = None
+            if tracked and tracked_run < track_frames:
+                detections = rescan(frame)
+                tracked_run += 1
+            if detections is None:
+                detections = scan(frame)
+                tracked_run = 0
+            if track_frames:
+                tracked = [
+                    (det.center[0], det.center[1], 2.0 * det.area**0.5)
+                    for det in detections
+                ]
+            latest.release(_READER_DETECTION)
             latency_ms = (time.monotonic() - t0) * 1000.0
-            fps.tick()
-            stats.update_detect(fps.fps, latency_ms)
+            if fps.tick():
+                stats.update_detect(fps.fps, latency_ms)
             out.update(detections, version)
 
     thread = threading.Thread(target=run, daemon=True)
@@ -217,11 +352,77 @@ def _start_detection_thread(
     return thread
 
 
-def _pick_detection(detections):
-    """Select largest QR code by area (handles overlapping codes)."""
-    if not detections:
-        return None
-    return max(detections, key=lambda d: d.area)
+@njit(cache=True)
+def _pick_lr_loop(centers_x, areas, split_x):
+    """
+    Index of the largest-area detection left and right of split_x (-1 if none).
+
+    Largest wins so overlapping codes resolve to the nearest one; ties keep
+    the first, like max().
+    """
+    left = -1
+    right = -1
+    left_area = 0.0
+    right_area = 0.0
+    for i in range(centers_x.shape[0]):
+        if centers_x[i] < split_x:
+            if left < 0 or areas[i] > left_area:
+                left = i
+                left_area = areas[i]
+        elif right < 0 or areas[i] > right_area:
+            right = i
+            right_area = areas[i]
+    return left, right
+
+
+def _pick_lr_masked(centers_x, areas, split_x):
+    """NumPy version of _pick_lr_loop: one compare and two masked argmaxes."""
+    left_mask = centers_x < split_x
+    left = right = -1
+    if left_mask.any():
+        left = int(np.where(left_mask, areas, -np.inf).argmax())
+    if not left_mask.all():
+        right = int(np.where(left_mask, -np.inf, areas).argmax())
+    return left, right
+
+
+# Interpreted, the loop still beats NumPy's per-call overhead below ~32
+# detections (measured); a deck scene has two to four.
+_MASKED_PICK_MIN = 32
+
+
+def _pick_lr(centers_x, areas, split_x):
+    if not HAVE_NUMBA and centers_x.shape[0] >= _MASKED_PICK_MIN:
+        return _pick_lr_masked(centers_x, areas, split_x)
+    return _pick_lr_loop(centers_x, areas, split_x)
+
+
+def _bench_backends(reader, max_side: int = 0, frame_count: int = 100) -> None:
+    """Time every installed QR backend on the same captured grayscale frames."""
+    frames = []
+    misses = 0
+    while len(frames) < frame_count and misses < 10:
+        ok, frame = reader.read()
+        if not ok or frame is None:
+            misses += 1
+            continue
+        frames.append(cv2.cvtColor(frame, cv2.COLOR_BGR2GRAY))
+    if not frames:
+        print("No camera frames to benchmark on.")
+        return
+    print(f"Benchmarking QR backends on {len(frames)} frames")
+    for backend in BACKENDS:
+        try:
+            detector = QRDetector(backend=backend, max_side=max_side)
+        except RuntimeError as exc:
+            print(f"  {backend:>12}: skipped ({exc})")
+            continue
+        found = 0
+        t0 = time.perf_counter()
+        for frame in frames:
+            found += len(detector.detect(frame))
+        mean_ms = (time.perf_counter() - t0) * 1000.0 / len(frames)
+        print(f"  {backend:>12}: {mean_ms:7.2f} ms/frame, {found} codes")
 
 
 def main() -> int:
@@ -229,6 +430,11 @@ def main() -> int:
     parser = argparse.ArgumentParser(description="Schallpappenspieler live QR loader")
     parser.add_argument("--config", default="config.toml", help="Path to config TOML")
     parser.add_argument("--no-gui", action="store_true", help="Disable debug GUI")
+    parser.add_argument(
+        "--bench",
+        action="store_true",
+        help="Time each QR backend on 100 camera frames and exit",
+    )
     args = parser.parse_args()
 
     config = load_config(args.config)
@@ -240,19 +446,31 @@ def main() -> int:
     mixxx_cfg = config.get("mixxx", {})
     ui_cfg = config.get("ui", {})
 
-    cap = open_camera(
+    cap, reader = open_camera(
         cam_cfg.get("index", 0),
         cam_cfg.get("preferred_width", 0),
         cam_cfg.get("preferred_height", 0),
     )
 
+    if args.bench:
+        try:
+            _bench_backends(reader, qr_cfg.get("detect_max_side", 0))
+        finally:
+            reader.release()
+            cap.release()
+        return 0
+
     tracker = StateTracker(
         stable_seconds=timing_cfg.get("stable_seconds", 1.0),
         dropout_seconds=timing_cfg.get("dropout_seconds", 1.0),
         forget_seconds=timing_cfg.get("forget_seconds", 5.0),
+        dedup_seconds=timing_cfg.get("dedup_seconds", 0.0),
     )
 
-    detector = QRDetector(backend=qr_cfg.get("backend", "opencv"))
+    detector = QRDetector(
+        backend=qr_cfg.get("backend", "auto"),
+        max_side=qr_cfg.get("detect_max_side", 0),
+    )
 
     mixxx = MixxxController(
         MixxxConfig(
@@ -267,7 +485,15 @@ def main() -> int:
 
     show_gui = ui_cfg.get("show_debug", True) and not args.no_gui
     latest_roi = _LatestROI()
-    gui = DebugGUI(roi_sink=latest_roi) if show_gui else None
+    gui = None
+    if show_gui:
+        # ui.process hosts the GUI in a child process, off this process's GIL.
+        gui_cls = DebugGUIProcess if ui_cfg.get("process", False) else DebugGUI
+        gui = gui_cls(
+            roi_sink=latest_roi,
+            target_fps=ui_cfg.get("target_fps", 30.0),
+            use_opencl=ui_cfg.get("use_opencl", False),
+        )
 
     latest_frame = _LatestFrame()
     latest_detections = _LatestDetections()
@@ -276,10 +502,16 @@ def main() -> int:
 
     mirror = cam_cfg.get("mirror", True)
     cap_thread = _start_capture_thread(
-        cap, latest_frame, perf_stats, stop_event, mirror=mirror
+        reader, latest_frame, perf_stats, stop_event, mirror=mirror
     )
     det_thread = _start_detection_thread(
-        detector, latest_frame, latest_detections, latest_roi, perf_stats, stop_event
+        detector,
+        latest_frame,
+        latest_detections,
+        latest_roi,
+        perf_stats,
+        stop_event,
+        track_frames=qr_cfg.get("roi_track_frames", 0),
     )
 
     last_action = None
@@ -289,22 +521,24 @@ def main() -> int:
     split_ratio = split_cfg.get("ratio", 0.5)
     try:
         while True:
-            frame, frame_version = latest_frame.snapshot()
+            frame, frame_version = latest_frame.acquire(_READER_GUI)
             if frame is None:
-                time.sleep(0.01)
+                latest_frame.wait_newer(frame_version, timeout=0.1)
                 continue
 
             # No new frame — just keep GUI responsive without re-rendering
             if frame_version == last_frame_version:
+                latest_frame.release(_READER_GUI)
                 if gui:
+                    # Keeps pumping window events; waitKey(1) paces the loop.
                     if not gui.process_events():
                         break
                 else:
-                    time.sleep(0.005)
+                    latest_frame.wait_newer(frame_version, timeout=0.1)
                 continue
             last_frame_version = frame_version
 
-            detections, det_version = latest_detections.snapshot()
+            detections, centers_x, areas, det_version = latest_detections.snapshot()
             new_detections = det_version != last_detection_version
             if new_detections:
                 last_detection_version = det_version
@@ -312,37 +546,32 @@ def main() -> int:
             height, width = frame.shape[:2]
             split_x = int(width * split_ratio)
 
-            left_detections = [d for d in detections if d.center[0] < split_x]
-            right_detections = [d for d in detections if d.center[0] >= split_x]
-
-            left_det = _pick_detection(left_detections)
-            right_det = _pick_detection(right_detections)
-
-            now = time.monotonic()
-            left_event = tracker.update(
-                "left", left_det.text if left_det else None, now
-            )
-            right_event = tracker.update(
-                "right", right_det.text if right_det else None, now
+            left_idx, right_idx = _pick_lr(centers_x, areas, split_x)
+
+            now_ns = time.monotonic_ns()
+            now = now_ns / 1e9  # same clock as time.monotonic()
+            events = (
+                tracker.update_left(
+                    detections[left_idx].text if left_idx >= 0 else None, now_ns
+                ),
+                tracker.update_right(
+                    detections[right_idx].text if right_idx >= 0 else None, now_ns
+                ),
             )
+            for event in events:
+                if event is None:
+                    continue
+                print(f"Trigger {event.side}: {event.text}")
+                if mixxx.load_track(event.text, event.side):
+                    last_action = f"Loaded {event.side}: {event.text}"
 
-            if left_event:
-                print(f"Trigger left: {left_event.text}")
-                if mixxx.load_track(left_event.text, "left"):
-                    last_action = f"Loaded left: {left_event.text}"
-
-            if right_event:
-                print(f"Trigger right: {right_event.text}")
-                if mixxx.load_track(right_event.text, "right"):
-                    last_action = f"Loaded right: {right_event.text}"
-
-            gui_fps.tick()
-            perf_stats.update_gui(gui_fps.fps)
+            if gui_fps.tick():
+                perf_stats.update_gui(gui_fps.fps)
 
             if gui:
-                display = frame.copy()
+                # The GUI copies the pinned frame into its own canvas.
                 keep_running = gui.render(
-                    display,
+                    frame,
                     detections,
                     split_x,
                     tracker.left,
@@ -351,17 +580,19 @@ def main() -> int:
                     now,
                     perf_stats=perf_stats,
                 )
+                latest_frame.release(_READER_GUI)
                 if not keep_running:
                     break
             else:
-                time.sleep(0.005)
+                latest_frame.release(_READER_GUI)
     finally:
         stop_event.set()
         cap_thread.join(timeout=1.0)
         det_thread.join(timeout=1.0)
+        reader.release()
         cap.release()
         if gui:
-            cv2.destroyAllWindows()
+            gui.close()
 
     return 0
 
@@ -2,7 +2,7 @@ import shutil
 import subprocess
 import time
 from dataclasses import dataclass
-from typing import Optional
+from typing import List, Optional
 
 
 @dataclass
@@ -20,8 +20,13 @@ class MixxxController:
         self.config = config
         self._xclip = shutil.which("xclip")
         self._xsel = shutil.which("xsel")
+        # Mixxx's window rarely changes between loads; rescanned on failure.
+        self._cached_win_id: Optional[str] = None
 
-    def _find_window_id(self) -> Optional[str]:
+    def _find_window_id(self, refresh: bool = False) -> Optional[str]:
+        if self._cached_win_id and not refresh:
+            return self._cached_win_id
+        self._cached_win_id = None
         try:
             output = subprocess.check_output(["wmctrl", "-lx"], text=True)
         except subprocess.CalledProcessError:
@@ -33,6 +38,7 @@ class MixxxController:
                 len(parts) >= 3
                 and self.config.window_class_hint.lower() in parts[2].lower()
             ):
+                self._cached_win_id = parts[0]
                 return parts[0]
         return None
 
@@ -42,13 +48,18 @@ class MixxxController:
             time.sleep(self.config.step_delay_seconds)
             return True
         except subprocess.CalledProcessError:
+            self._cached_win_id = None
             return False
 
-    def _exec_key(self, win_id: str, key: str) -> bool:
+    def _run_script(self, lines: List[str]) -> bool:
+        """Run xdotool commands (and sleeps) in a single xdotool process."""
         try:
-            subprocess.run(["xdotool", "key", "--window", win_id, key], check=True)
+            subprocess.run(
+                ["xdotool", "-"], input="\n".join(lines) + "\n", text=True, check=True
+            )
             return True
         except subprocess.CalledProcessError:
+            self._cached_win_id = None
             return False
 
     def _type_text(self, win_id: str, text: str) -> bool:
@@ -58,30 +69,18 @@ class MixxxController:
         except subprocess.CalledProcessError:
             return False
 
-    def _paste_text(self, win_id: str, text: str) -> bool:
+    def _set_clipboard(self, text: str) -> bool:
         if self._xclip:
-            try:
-                subprocess.run(
-                    ["xclip", "-selection", "clipboard"],
-                    input=text,
-                    text=True,
-                    check=True,
-                )
-                return self._exec_key(win_id, "ctrl+v")
-            except subprocess.CalledProcessError:
-                return False
-        if self._xsel:
-            try:
-                subprocess.run(
-                    ["xsel", "--clipboard", "--input"],
-                    input=text,
-                    text=True,
-                    check=True,
-                )
-                return self._exec_key(win_id, "ctrl+v")
-            except subprocess.CalledProcessError:
-                return False
-        return False
+            command = ["xclip", "-selection", "clipboard"]
+        elif self._xsel:
+            command = ["xsel", "--clipboard", "--input"]
+        else:
+            return False
+        try:
+            subprocess.run(command, input=text, text=True, check=True)
+            return True
+        except subprocess.CalledProcessError:
+            return False
 
     def load_track(self, text: str, deck: str) -> bool:
         win_id = self._find_window_id()
@@ -90,30 +89,39 @@ class MixxxController:
             return False
 
         if not self._focus_window(win_id):
-            print("Failed to focus Mixxx window.")
-            return False
-
-        if not self._exec_key(win_id, self.config.search_hotkey):
-            print("Failed to open search.")
-            return False
-        time.sleep(self.config.step_delay_seconds)
-
-        if not self._paste_text(win_id, text):
-            if not self._type_text(win_id, text):
-                print("Failed to enter search text.")
+            # The cached id may belong to a window that has since closed.
+            win_id = self._find_window_id(refresh=True)
+            if not win_id or not self._focus_window(win_id):
+                print("Failed to focus Mixxx window.")
                 return False
-        time.sleep(self.config.step_delay_seconds)
-
-        for _ in range(self.config.result_tab_count):
-            if not self._exec_key(win_id, "Tab"):
-                print("Failed to tab to results.")
-                return False
-            time.sleep(self.config.step_delay_seconds)
 
+        # Key presses and the delays between them go to one xdotool process
+        # instead of one fork per key.
+        pause = f"sleep {self.config.step_delay_seconds}"
+        search = [f"key --window {win_id} {self.config.search_hotkey}", pause]
         deck_key = (
             self.config.right_deck_key if deck == "right" else self.config.left_deck_key
         )
-        if not self._exec_key(win_id, deck_key):
+        select = [f"key --window {win_id} Tab", pause] * self.config.result_tab_count
+        select.append(f"key --window {win_id} {deck_key}")
+
+        if self._set_clipboard(text):
+            paste = [f"key --window {win_id} ctrl+v", pause]
+            if not self._run_script(search + paste + select):
+                print("Failed to send keys to Mixxx.")
+                return False
+            return True
+
+        # No clipboard tool: type the text between two scripts, since the
+        # xdotool script syntax can't carry arbitrary text safely.
+        if not self._run_script(search):
+            print("Failed to open search.")
+            return False
+        if not self._type_text(win_id, text):
+            print("Failed to enter search text.")
+            return False
+        time.sleep(self.config.step_delay_seconds)
+        if not self._run_script(select):
             print("Failed to select deck.")
             return False
 
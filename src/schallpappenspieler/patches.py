@@ -1,68 +1,116 @@
 import argparse
-import io
+import itertools
+from concurrent.futures import ThreadPoolExecutor, as_completed
 from pathlib import Path
-from typing import List, Optional, Tuple
+from typing import Iterator, List, Optional, Tuple
 
+import cv2
+import numpy as np
 import qrcode
 import requests
 from PIL import Image
+from requests.adapters import HTTPAdapter
 from tqdm import tqdm
 
 from schallpappenspieler.config import load_config, load_env
-from schallpappenspieler.discogs import DiscogsClient
+from schallpappenspieler.discogs import DEFAULT_CACHE_PATH, DiscogsClient
 from schallpappenspieler.pdf_layout import PatchAssets, render_patches_to_pdf
 
+# Cover lookups are I/O bound; DiscogsClient's token bucket keeps the
+# concurrent searches within the API rate limit.
+_COVER_WORKERS = 8
 
-def _parse_m3u(path: str) -> List[str]:
-    lines = []
+# Shared by the download workers so cover images reuse kept-alive connections.
+_SESSION = requests.Session()
+_SESSION.mount("https://", HTTPAdapter(pool_connections=16, pool_maxsize=16))
+
+_IMAGE_HEADERS = {
+    "User-Agent": "Mozilla/5.0 (compatible; schallpappenspieler/0.1)",
+    "Accept": "image/*,*/*;q=0.8",
+}
+_DISCOGS_IMAGE_HEADERS = {**_IMAGE_HEADERS, "Referer": "https://www.discogs.com/"}
+
+
+def _iter_m3u(path: str) -> Iterator[str]:
+    """Yield playlist entries lazily, so callers taking a few stop reading early."""
     with open(path, "r", encoding="utf-8") as f:
         for line in f:
             line = line.strip()
-            if not line or line.startswith("#"):
-                continue
-            lines.append(line)
-    return lines
+            if line and line[0] != "#":
+                yield line
 
 
-def _make_qr_image(text: str) -> Image.Image:
-    qr = qrcode.QRCode(border=1, box_size=10)
+def _make_qr_image(text: str, box_size: int = 10) -> Image.Image:
+    qr = qrcode.QRCode(border=1, box_size=box_size)
     qr.add_data(text)
     qr.make(fit=True)
-    img = qr.make_image(fill_color="black", back_color="white")
-    return img.convert("RGB")
+    # get_matrix() already includes the border; scale modules up with NumPy
+    # instead of letting qrcode draw every box through PIL.
+    dark = np.asarray(qr.get_matrix(), dtype=bool)
+    pixels = np.where(dark, 0, 255).astype(np.uint8)
+    pixels = pixels.repeat(box_size, axis=0).repeat(box_size, axis=1)
+    return Image.fromarray(pixels, "L")
 
 
 def _image_from_bytes(data: bytes) -> Image.Image | None:
+    """Decode JPEG/PNG bytes with OpenCV (libjpeg-turbo); None if undecodable."""
     if not data:
         return None
-    return Image.open(io.BytesIO(data)).convert("RGB")
+    img = cv2.imdecode(np.frombuffer(data, np.uint8), cv2.IMREAD_COLOR)
+    if img is None:
+        return None
+    return Image.fromarray(cv2.cvtColor(img, cv2.COLOR_BGR2RGB))
 
 
 def _load_image_from_url(url: str) -> Image.Image | None:
     if not url:
         return None
-    headers = {
-        "User-Agent": "Mozilla/5.0 (compatible; schallpappenspieler/0.1)",
-        "Accept": "image/*,*/*;q=0.8",
-    }
-    if "discogs.com" in url:
-        headers["Referer"] = "https://www.discogs.com/"
+    headers = _DISCOGS_IMAGE_HEADERS if "discogs.com" in url else _IMAGE_HEADERS
     try:
-        resp = requests.get(url, headers=headers, timeout=15)
+        resp = _SESSION.get(url, headers=headers, timeout=15)
     except requests.RequestException:
         return None
     if resp.status_code != 200:
         return None
-    return Image.open(io.BytesIO(resp.content)).convert("RGB")
+    return _image_from_bytes(resp.content)
 
 
 def _split_artist_title(name: str) -> Tuple[Optional[str], str]:
-    if " - " in name:
-        artist, title = name.split(" - ", 1)
+    artist, sep, title = name.partition(" - ")
+    if sep:
         return artist.strip() or None, title.strip()
     return None, name.strip()
 
 
+def _fetch_album_image(
+    discogs_client: DiscogsClient, display_name: str
+) -> Image.Image | None:
+    artist, title = _split_artist_title(display_name)
+    cover_url = discogs_client.search_cover(title, artist)
+    album_img = _load_image_from_url(cover_url) if cover_url else None
+    discogs_client.wait_if_limited()
+    return album_img
+
+
+def _fetch_album_images(
+    discogs_client: DiscogsClient, display_names: List[str]
+) -> List[Image.Image | None]:
+    """Fetch covers concurrently; results keep the order of display_names."""
+    images: List[Image.Image | None] = [None] * len(display_names)
+    with ThreadPoolExecutor(max_workers=_COVER_WORKERS) as pool:
+        futures = {
+            pool.submit(_fetch_album_image, discogs_client, name): i
+            for i, name in enumerate(display_names)
+        }
+        progress = tqdm(as_completed(futures), total=len(futures), desc="Covers")
+        for future in progress:
+            images[futures[future]] = future.result()
+            rate = discogs_client.last_rate
+            if rate and rate.remaining is not None:
+                progress.set_postfix_str(f"discogs_remaining={rate.remaining}")
+    return images
+
+
 def main() -> int:
     parser = argparse.ArgumentParser(description="Generate song patch PDFs from M3U")
     parser.add_argument("--config", default="config.toml", help="Path to config TOML")
@@ -98,45 +146,33 @@ def main() -> int:
         if not discogs_token:
             print("Discogs token missing; continuing without Discogs covers.")
         else:
-            discogs_client = DiscogsClient(discogs_token, user_agent)
+            cache_path = discogs_cfg.get("cache_path", str(DEFAULT_CACHE_PATH))
+            discogs_client = DiscogsClient(
+                discogs_token, user_agent, cache_path=cache_path or None
+            )
 
     output_pdf = args.output or patches_cfg.get("output_pdf", "songpatches.pdf")
 
-    entries = _parse_m3u(args.m3u)[0:8]
-    assets: List[PatchAssets] = []
+    entries = [Path(entry) for entry in itertools.islice(_iter_m3u(args.m3u), 8)]
+    display_names = [entry.stem for entry in entries]
 
-    progress = tqdm(entries, desc="Building patches")
-    for entry in progress:
-        filename = Path(entry).name
-        display_name = Path(entry).stem
-        print(f"Processing: {display_name}")
+    album_images: List[Image.Image | None] = [None] * len(entries)
+    if cover_source == "discogs" and discogs_client:
+        album_images = _fetch_album_images(discogs_client, display_names)
 
+    assets: List[PatchAssets] = []
+    for entry, display_name, album_img in tqdm(
+        zip(entries, display_names, album_images),
+        total=len(entries),
+        desc="Building patches",
+    ):
+        print(f"Processing: {display_name}")
         artist, title = _split_artist_title(display_name)
-
-        album_img = None
-
-        if cover_source == "discogs" and discogs_client:
-            artist, title = _split_artist_title(display_name)
-            cover_url = discogs_client.search_cover(title, artist)
-            if cover_url:
-                album_img = _load_image_from_url(cover_url)
-            rate = discogs_client.last_rate
-            if rate and rate.remaining is not None:
-                progress.set_postfix_str(f"discogs_remaining={rate.remaining}")
-            waited = discogs_client.wait_if_limited()
-            if waited > 0:
-                progress.set_postfix_str(f"discogs_wait={waited}s")
-
-        if cover_source == "none":
-            album_img = None
-
-        qr_img = _make_qr_image(filename)
-
         assets.append(
             PatchAssets(
                 display_name=display_name,
-                filename=filename,
-                qr_image=qr_img,
+                filename=entry.name,
+                qr_image=_make_qr_image(entry.name),
                 album_image=album_img,
                 artist=artist,
                 title=title,
@@ -151,6 +187,7 @@ def main() -> int:
         patches_cfg.get("page_width_mm", 210),
         patches_cfg.get("page_height_mm", 297),
         layout_mode,
+        workers=patches_cfg.get("render_workers", 1),
     )
     print(f"Wrote {output_pdf}")
     return 0
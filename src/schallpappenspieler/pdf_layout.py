@@ -1,6 +1,9 @@
-import hashlib
+import bisect
+import io
 import math
+from concurrent.futures import ProcessPoolExecutor
 from dataclasses import dataclass
+from itertools import repeat
 from typing import Iterable, Optional
 
 from PIL import Image
@@ -8,6 +11,8 @@ from reportlab.lib.units import cm, mm
 from reportlab.lib.utils import ImageReader
 from reportlab.pdfgen import canvas
 
+from ._text_fit import LINE_OVERLONG, fit_words, prefix_units, text_width
+
 
 @dataclass
 class PatchAssets:
@@ -18,9 +23,33 @@ class PatchAssets:
     artist: Optional[str] = None
     title: Optional[str] = None
 
+    def __post_init__(self) -> None:
+        # Normalize modes once so drawImage never has to probe for alpha.
+        self.qr_image = _opaque_image(self.qr_image)
+        if self.album_image is not None:
+            self.album_image = _opaque_image(self.album_image)
+
+
+def _opaque_image(image: Image.Image) -> Image.Image:
+    """Return image as L or RGB, compositing any transparency onto white paper."""
+    if image.mode in ("L", "RGB"):
+        return image
+    if "A" in image.getbands() or "transparency" in image.info:
+        image = image.convert("RGBA")
+        flat = Image.new("RGB", image.size, (255, 255, 255))
+        flat.paste(image, mask=image.getchannel("A"))
+        return flat
+    return image.convert("L" if image.mode == "1" else "RGB")
+
 
 def _draw_image_fit(
-    c, image: Image.Image, x: float, y: float, w: float, h: float
+    c,
+    image: Image.Image,
+    x: float,
+    y: float,
+    w: float,
+    h: float,
+    readers: dict[int, ImageReader],
 ) -> None:
     img_w, img_h = image.size
     if img_w == 0 or img_h == 0:
@@ -30,21 +59,34 @@ def _draw_image_fit(
     draw_h = img_h * scale
     draw_x = x + (w - draw_w) / 2
     draw_y = y + (h - draw_h) / 2
-    c.drawImage(ImageReader(image), draw_x, draw_y, draw_w, draw_h, mask="auto")
+    # ImageReader extracts and hashes the pixel data; do that once per image.
+    reader = readers.get(id(image))
+    if reader is None:
+        reader = readers[id(image)] = ImageReader(image)
+    c.drawImage(reader, draw_x, draw_y, draw_w, draw_h)
 
 
 def _truncate_text(c, text: str, max_width: float) -> str:
     if not text:
         return ""
-    if c.stringWidth(text) <= max_width:
+    font_name, font_size = c._fontname, c._fontsize
+    if text_width(text, font_name, font_size) <= max_width:
         return text
     ellipsis = "..."
-    if c.stringWidth(ellipsis) > max_width:
+    ellipsis_width = text_width(ellipsis, font_name, font_size)
+    if ellipsis_width > max_width:
         return ""
-    max_width -= c.stringWidth(ellipsis)
-    trimmed = text
-    while trimmed and c.stringWidth(trimmed) > max_width:
-        trimmed = trimmed[:-1]
+    max_width -= ellipsis_width
+    # Widths of all prefixes at once; binary-search the longest that fits.
+    keep = (
+        bisect.bisect_right(
+            prefix_units(text, font_name),
+            max_width,
+            key=lambda units: units * 0.001 * font_size,
+        )
+        - 1
+    )
+    trimmed = text[:keep]
     return (trimmed.rstrip() + ellipsis) if trimmed else ellipsis
 
 
@@ -54,42 +96,17 @@ def _wrap_text_lines(
     words = text.split()
     if not words or max_lines <= 0:
         return []
+    joined, spans, next_word = fit_words(
+        words, c._fontname, c._fontsize, max_widths, max_lines
+    )
     lines: list[str] = []
-    current = ""
-    line_index = 0
-    word_index = 0
-    truncated = False
-
-    while word_index < len(words) and line_index < max_lines:
-        width = max_widths[line_index] if line_index < len(max_widths) else 0.0
-        if width <= 0:
-            truncated = True
-            break
-        word = words[word_index]
-        candidate = word if not current else f"{current} {word}"
-        if c.stringWidth(candidate) <= width:
-            current = candidate
-            word_index += 1
-            continue
-
-        if current:
-            lines.append(current)
-            line_index += 1
-            current = ""
-            continue
-
-        lines.append(_truncate_text(c, word, width))
-        line_index += 1
-        word_index += 1
-
-    if line_index < max_lines and current:
-        lines.append(current)
-        line_index += 1
-
-    if word_index < len(words):
-        truncated = True
-
-    if truncated and lines:
+    for i, (kind, start, end) in enumerate(spans):
+        if kind == LINE_OVERLONG:
+            lines.append(_truncate_text(c, joined[start:end], max_widths[i]))
+        else:
+            lines.append(joined[start:end])
+
+    if next_word < len(words) and lines:
         last_index = min(len(lines), max_lines) - 1
         lines = lines[:max_lines]
         width = max_widths[last_index] if last_index < len(max_widths) else 0.0
@@ -114,12 +131,6 @@ def _max_width_at_y(radius: float, y: float, padding: float) -> float:
     return max(0.0, chord - 2 * padding)
 
 
-def _seed_for_patch(patch: PatchAssets) -> int:
-    seed_text = f"{patch.artist or ''}|{patch.title or patch.display_name}"
-    digest = hashlib.sha256(seed_text.encode("utf-8")).digest()
-    return int.from_bytes(digest[:8], "big")
-
-
 def _max_square_size_in_circle(radius: float, gap: float) -> float:
     if radius <= 0:
         return 0.0
@@ -130,30 +141,27 @@ def _max_square_size_in_circle(radius: float, gap: float) -> float:
     return max(0.0, (-2 * g + math.sqrt(disc)) / 2.5)
 
 
+def _text_box_limit(radius: float, offset: float, box_height: float) -> float:
+    """Widest box of box_height centred offset from the circle centre."""
+    half = box_height / 2
+    return min(
+        _max_width_at_y(radius, offset + half, 0.0),
+        _max_width_at_y(radius, offset - half, 0.0),
+    )
+
+
 def _draw_text_box(
     c,
     lines: list[str],
     center_x: float,
     center_y: float,
-    line_height: float,
+    box_height: float,
+    max_allowed: float,
     box_pad: float,
-    radius: float,
-    circle_center_y: float,
 ) -> None:
-    if not lines:
-        return
-    block_height = line_height * len(lines)
-    box_height = block_height + 2 * box_pad
-    if box_height <= 0:
+    if not lines or box_height <= 0 or max_allowed <= 0:
         return
-    top_y = center_y + box_height / 2
-    bottom_y = center_y - box_height / 2
-    max_w_top = _max_width_at_y(radius, top_y - circle_center_y, 0.0)
-    max_w_bottom = _max_width_at_y(radius, bottom_y - circle_center_y, 0.0)
-    max_allowed = min(max_w_top, max_w_bottom)
-    if max_allowed <= 0:
-        return
-    max_line = max(c.stringWidth(line) for line in lines)
+    max_line = max(text_width(line, c._fontname, c._fontsize) for line in lines)
     box_width = min(max_line + 2 * box_pad, max_allowed)
     if box_width <= 0:
         return
@@ -170,6 +178,46 @@ def _draw_text_box(
     c.restoreState()
 
 
+def _begin_page(c, font_name: str, font_size: float) -> None:
+    """Set the text state every patch on a page shares."""
+    # showPage() resets the graphics state, so this runs once per page. Fill
+    # stays black: the white text boxes restore it via saveState/restoreState.
+    c.setFont(font_name, font_size)
+
+
+_OUTLINE_FORM = "patchOutline"
+
+
+def _define_outline_form(c, radius: float) -> None:
+    """Store the dashed cut outline once, centred on the origin, as a form."""
+    # Half the line width of slack so the stroke is not clipped to the bbox.
+    extent = radius + 0.25
+    c.beginForm(_OUTLINE_FORM, -extent, -extent, extent, extent)
+    c.setLineWidth(0.5)
+    c.setDash(2, 2)
+    c.setStrokeColorRGB(0, 0, 0)
+    c.circle(0, 0, radius, stroke=1, fill=0)
+    c.endForm()
+
+
+def _require_pypdf():
+    try:
+        import pypdf  # type: ignore
+    except ImportError as exc:
+        raise RuntimeError(
+            "pypdf is not installed; pip install schallpappenspieler[pdf]"
+        ) from exc
+    return pypdf
+
+
+def _grid(patch_size_mm: float, page_width_mm: float, page_height_mm: float):
+    cols = int(page_width_mm // patch_size_mm)
+    rows = int(page_height_mm // patch_size_mm)
+    if cols <= 0 or rows <= 0:
+        raise ValueError("Patch size too large for the page size")
+    return cols, rows
+
+
 def render_patches_to_pdf(
     patches: Iterable[PatchAssets],
     output_path: str,
@@ -178,59 +226,155 @@ def render_patches_to_pdf(
     page_width_mm: float,
     page_height_mm: float,
     layout_mode: str = "halfsize_cover",
+    workers: int = 1,
 ) -> None:
-    patch_size_mm = patch_size_cm * 10.0
+    """
+    Lay the patches out on as many pages as needed and write the PDF.
 
-    cols = int(page_width_mm // patch_size_mm)
-    rows = int(page_height_mm // patch_size_mm)
-    if cols <= 0 or rows <= 0:
-        raise ValueError("Patch size too large for the page size")
+    With workers > 1 and more than one page, pages are rendered in separate
+    processes and merged with pypdf (pip install schallpappenspieler[pdf]).
+    """
+    cols, rows = _grid(patch_size_cm * 10.0, page_width_mm, page_height_mm)
+    patches = list(patches)
+    per_page = cols * rows
+    layout = (patch_size_cm, qr_size_cm, page_width_mm, page_height_mm, layout_mode)
+    pages = [patches[i : i + per_page] for i in range(0, len(patches), per_page)]
+
+    if workers <= 1 or len(pages) <= 1:
+        c = canvas.Canvas(
+            output_path, pagesize=(page_width_mm * mm, page_height_mm * mm)
+        )
+        _draw_patches(c, patches, *layout)
+        c.save()
+        return
 
-    margin_x_mm = (page_width_mm - cols * patch_size_mm) / 2.0
-    margin_y_mm = (page_height_mm - rows * patch_size_mm) / 2.0
+    pypdf = _require_pypdf()
+    with ProcessPoolExecutor(max_workers=min(workers, len(pages))) as pool:
+        rendered = list(pool.map(_render_page_pdf, pages, repeat(layout)))
+    writer = pypdf.PdfWriter()
+    for page_pdf in rendered:
+        writer.append(io.BytesIO(page_pdf))
+    with open(output_path, "wb") as f:
+        writer.write(f)
+
+
+def _render_page_pdf(page: list[PatchAssets], layout: tuple) -> bytes:
+    """Worker: render one page of patches to an in-memory PDF."""
+    buffer = io.BytesIO()
+    page_width_mm, page_height_mm = layout[2], layout[3]
+    c = canvas.Canvas(buffer, pagesize=(page_width_mm * mm, page_height_mm * mm))
+    _draw_patches(c, page, *layout)
+    c.save()
+    return buffer.getvalue()
 
-    page_width_pt = page_width_mm * mm
-    page_height_pt = page_height_mm * mm
-    c = canvas.Canvas(output_path, pagesize=(page_width_pt, page_height_pt))
 
-    patches = list(patches)
-    per_page = cols * rows
+def _draw_patches(
+    c,
+    patches: list[PatchAssets],
+    patch_size_cm: float,
+    qr_size_cm: float,
+    page_width_mm: float,
+    page_height_mm: float,
+    layout_mode: str,
+) -> None:
+    """Draw patches onto c, starting a new page every cols * rows patches."""
+    patch_size_mm = patch_size_cm * 10.0
+    cols, rows = _grid(patch_size_mm, page_width_mm, page_height_mm)
 
-    for index, patch in enumerate(patches):
-        if index > 0 and index % per_page == 0:
-            c.showPage()
+    margin_x_mm = (page_width_mm - cols * patch_size_mm) / 2.0
+    margin_y_mm = (page_height_mm - rows * patch_size_mm) / 2.0
 
-        page_index = index % per_page
+    per_page = cols * rows
+    # Keyed by id(); the images stay alive in `patches` for the whole render.
+    readers: dict[int, ImageReader] = {}
+
+    # Identical for every patch; computed once instead of per loop pass.
+    patch_size = patch_size_mm * mm
+    radius = patch_size / 2
+    inner_pad = 1.0 * mm
+    image_inset = 3.0 * mm
+    safe_radius = max(0.0, radius - inner_pad)
+    image_radius = max(0.0, safe_radius - image_inset)
+
+    font_name = "Helvetica"
+    font_size = 10
+    line_height = font_size * 1.2
+    max_lines = 2
+    text_box_pad = 0.6 * mm
+    text_band = max_lines * line_height
+
+    # Patch centres for each grid cell, in PDF points.
+    cell_centers = []
+    for page_index in range(per_page):
         row = page_index // cols
         col = page_index % cols
-
         patch_x_mm = margin_x_mm + col * patch_size_mm
         patch_y_mm = page_height_mm - margin_y_mm - (row + 1) * patch_size_mm
+        cell_centers.append(
+            (patch_x_mm * mm + patch_size / 2, patch_y_mm * mm + patch_size / 2)
+        )
+
+    if layout_mode == "fullsize_cover":
+        text_inset = 2.0 * mm
+        cover_size = min(6.5 * cm, 2 * safe_radius)
+        cover_size = max(0.0, cover_size)
+        max_qr_size = image_radius * math.sqrt(2) * 0.9
+        qr_size = min(qr_size_cm * 10.0 * mm, max_qr_size)
+        qr_size = max(0.0, qr_size)
+        # Push the QR as far right as the image circle allows.
+        qr_offset = max(
+            0.0,
+            math.sqrt(max(image_radius * image_radius - (qr_size / 2) ** 2, 0.0))
+            - qr_size / 2,
+        )
+        # Text block centres relative to the patch centre.
+        top_offset = image_radius - text_band / 2 - text_inset
+        bottom_offset = -image_radius + text_band / 2 + text_inset
+    else:
+        gap = 1.5 * mm
+        text_inset = 4.0 * mm
+        content_height = max(0.0, 2 * image_radius - 2 * text_band - 2 * gap)
+        content_height_inner = max(0.0, content_height - 2 * text_inset)
+
+        g = gap / 2
+        size_limit = (2 * image_radius - gap) / 2
+        corner_limit = _max_square_size_in_circle(image_radius, gap)
+        square_size = min(content_height_inner, size_limit, corner_limit)
+        square_size = max(0.0, square_size)
+        top_offset = content_height / 2 + gap + text_band / 2 - text_inset
+        bottom_offset = -content_height / 2 - gap - text_band / 2 + text_inset
+
+    # Chord widths at every text line position; the same for each patch.
+    top_widths = [
+        _max_width_at_y(safe_radius, y, text_box_pad)
+        for y in _line_positions(top_offset, line_height, max_lines)
+    ]
+    bottom_widths = [
+        _max_width_at_y(safe_radius, y, text_box_pad)
+        for y in _line_positions(bottom_offset, line_height, max_lines)
+    ]
+    # Backing box height and the widest box the circle allows, by line count.
+    box_heights = [n * line_height + 2 * text_box_pad for n in range(max_lines + 1)]
+    text_blocks = [
+        (offset, widths, [_text_box_limit(safe_radius, offset, h) for h in box_heights])
+        for offset, widths in ((top_offset, top_widths), (bottom_offset, bottom_widths))
+    ]
+    # Line baselines relative to a block centre, by number of lines.
+    line_offsets = [_line_positions(0.0, line_height, n) for n in range(max_lines + 1)]
+
+    _define_outline_form(c, radius)
+    _begin_page(c, font_name, font_size)
+    for index, patch in enumerate(patches):
+        if index > 0 and index % per_page == 0:
+            c.showPage()
+            _begin_page(c, font_name, font_size)
 
-        patch_x = patch_x_mm * mm
-        patch_y = patch_y_mm * mm
-        patch_size = patch_size_mm * mm
-
-        center_x = patch_x + patch_size / 2
-        center_y = patch_y + patch_size / 2
-        radius = patch_size / 2
-
-        inner_pad = 1.0 * mm
-        image_inset = 3.0 * mm
-        safe_radius = max(0.0, radius - inner_pad)
-        image_radius = max(0.0, safe_radius - image_inset)
+        center_x, center_y = cell_centers[index % per_page]
 
-        font_name = "Helvetica"
-        font_size = 10
-        line_height = font_size * 1.2
-        max_lines = 2
-        text_box_pad = 0.6 * mm
         artist = patch.artist or ""
         title = patch.title or patch.display_name
 
         if layout_mode == "fullsize_cover":
-            cover_size = min(6.5 * cm, 2 * safe_radius)
-            cover_size = max(0.0, cover_size)
             cover_x = center_x - cover_size / 2
             cover_y = center_y - cover_size / 2
             if patch.album_image and cover_size > 0:
@@ -239,96 +383,24 @@ def render_patches_to_pdf(
                 clip.circle(center_x, center_y, safe_radius)
                 c.clipPath(clip, stroke=0, fill=0)
                 _draw_image_fit(
-                    c, patch.album_image, cover_x, cover_y, cover_size, cover_size
+                    c,
+                    patch.album_image,
+                    cover_x,
+                    cover_y,
+                    cover_size,
+                    cover_size,
+                    readers,
                 )
                 c.restoreState()
 
-            max_qr_size = image_radius * math.sqrt(2) * 0.9
-            qr_size = min(qr_size_cm * 10.0 * mm, max_qr_size)
-            qr_size = max(0.0, qr_size)
             if qr_size > 0:
-                max_offset = (
-                    math.sqrt(
-                        max(image_radius * image_radius - (qr_size / 2) ** 2, 0.0)
-                    )
-                    - qr_size / 2
-                )
-                qr_center_x = center_x + max(0.0, max_offset)
+                qr_center_x = center_x + qr_offset
                 qr_x = qr_center_x - qr_size / 2
                 qr_y = center_y - qr_size / 2
-                _draw_image_fit(c, patch.qr_image, qr_x, qr_y, qr_size, qr_size)
-
-            c.setFont(font_name, font_size)
-            if artist:
-                text_inset = 2.0 * mm
-                text_band = max_lines * line_height
-                top_center_y = center_y + image_radius - text_band / 2 - text_inset
-                top_positions = _line_positions(top_center_y, line_height, max_lines)
-                top_widths = [
-                    _max_width_at_y(safe_radius, y - center_y, text_box_pad)
-                    for y in top_positions
-                ]
-                top_lines = _wrap_text_lines(c, artist, max_lines, top_widths)
-                if top_lines:
-                    _draw_text_box(
-                        c,
-                        top_lines,
-                        center_x,
-                        top_center_y,
-                        line_height,
-                        text_box_pad,
-                        safe_radius,
-                        center_y,
-                    )
-                    top_positions = _line_positions(
-                        top_center_y, line_height, len(top_lines)
-                    )
-                    c.setFillColorRGB(0, 0, 0)
-                    for line, y in zip(top_lines, top_positions):
-                        c.drawCentredString(center_x, y, line)
-
-            if title:
-                text_inset = 2.0 * mm
-                text_band = max_lines * line_height
-                bottom_center_y = center_y - image_radius + text_band / 2 + text_inset
-                bottom_positions = _line_positions(
-                    bottom_center_y, line_height, max_lines
+                _draw_image_fit(
+                    c, patch.qr_image, qr_x, qr_y, qr_size, qr_size, readers
                 )
-                bottom_widths = [
-                    _max_width_at_y(safe_radius, y - center_y, text_box_pad)
-                    for y in bottom_positions
-                ]
-                bottom_lines = _wrap_text_lines(c, title, max_lines, bottom_widths)
-                if bottom_lines:
-                    _draw_text_box(
-                        c,
-                        bottom_lines,
-                        center_x,
-                        bottom_center_y,
-                        line_height,
-                        text_box_pad,
-                        safe_radius,
-                        center_y,
-                    )
-                    bottom_positions = _line_positions(
-                        bottom_center_y, line_height, len(bottom_lines)
-                    )
-                    c.setFillColorRGB(0, 0, 0)
-                    for line, y in zip(bottom_lines, bottom_positions):
-                        c.drawCentredString(center_x, y, line)
         else:
-            text_band = max_lines * line_height
-            gap = 1.5 * mm
-            text_inset = 4.0 * mm
-            content_height = max(0.0, 2 * image_radius - 2 * text_band - 2 * gap)
-            content_height_inner = max(0.0, content_height - 2 * text_inset)
-
-            g = gap / 2
-            size_limit = (2 * image_radius - gap) / 2
-            corner_limit = _max_square_size_in_circle(image_radius, gap)
-            square_size = min(content_height_inner, size_limit, corner_limit)
-            square_size = max(0.0, square_size)
-
             cover_x = center_x - g - square_size
             cover_y = center_y - square_size / 2
             qr_x = center_x + g
@@ -342,6 +414,7 @@ def render_patches_to_pdf(
                     cover_y,
                     square_size,
                     square_size,
+                    readers,
                 )
 
             if square_size > 0:
@@ -352,72 +425,38 @@ def render_patches_to_pdf(
                     qr_y,
                     square_size,
                     square_size,
+                    readers,
                 )
 
-            c.setFont(font_name, font_size)
-            if artist:
-                top_center_y = (
-                    center_y + content_height / 2 + gap + text_band / 2 - text_inset
-                )
-                top_positions = _line_positions(top_center_y, line_height, max_lines)
-                top_widths = [
-                    _max_width_at_y(safe_radius, y - center_y, text_box_pad)
-                    for y in top_positions
-                ]
-                top_lines = _wrap_text_lines(c, artist, max_lines, top_widths)
-                if top_lines:
-                    _draw_text_box(
-                        c,
-                        top_lines,
-                        center_x,
-                        top_center_y,
-                        line_height,
-                        text_box_pad,
-                        safe_radius,
-                        center_y,
-                    )
-                    top_positions = _line_positions(
-                        top_center_y, line_height, len(top_lines)
-                    )
-                    c.setFillColorRGB(0, 0, 0)
-                    for line, y in zip(top_lines, top_positions):
-                        c.drawCentredString(center_x, y, line)
-
-            if title:
-                bottom_center_y = (
-                    center_y - content_height / 2 - gap - text_band / 2 + text_inset
-                )
-                bottom_positions = _line_positions(
-                    bottom_center_y, line_height, max_lines
-                )
-                bottom_widths = [
-                    _max_width_at_y(safe_radius, y - center_y, text_box_pad)
-                    for y in bottom_positions
-                ]
-                bottom_lines = _wrap_text_lines(c, title, max_lines, bottom_widths)
-                if bottom_lines:
-                    _draw_text_box(
-                        c,
-                        bottom_lines,
-                        center_x,
-                        bottom_center_y,
-                        line_height,
-                        text_box_pad,
-                        safe_radius,
-                        center_y,
-                    )
-                    bottom_positions = _line_positions(
-                        bottom_center_y, line_height, len(bottom_lines)
-                    )
-                    c.setFillColorRGB(0, 0, 0)
-                    for line, y in zip(bottom_lines, bottom_positions):
-                        c.drawCentredString(center_x, y, line)
+        for text, (offset, widths, box_limits) in zip((artist, title), text_blocks):
+            if not text:
+                continue
+            lines = _wrap_text_lines(c, text, max_lines, widths)
+            if not lines:
+                continue
+            block_center_y = center_y + offset
+            _draw_text_box(
+                c,
+                lines,
+                center_x,
+                block_center_y,
+                box_heights[len(lines)],
+                box_limits[len(lines)],
+                text_box_pad,
+            )
+            # One text object per block: a single BT/ET pair for all lines.
+            block = None
+            for line, dy in zip(lines, line_offsets[len(lines)]):
+                x = center_x - 0.5 * text_width(line, font_name, font_size)
+                y = block_center_y + dy
+                if block is None:
+                    block = c.beginText(x, y)
+                else:
+                    block.setTextOrigin(x, y)
+                block.textLine(line)
+            c.drawText(block)
 
         c.saveState()
-        c.setLineWidth(0.5)
-        c.setDash(2, 2)
-        c.setStrokeColorRGB(0, 0, 0)
-        c.circle(center_x, center_y, radius, stroke=1, fill=0)
+        c.translate(center_x, center_y)
+        c.doForm(_OUTLINE_FORM)
         c.restoreState()
-
-    c.save()
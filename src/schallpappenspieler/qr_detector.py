@@ -19,12 +19,74 @@ def _polygon_area(points: np.ndarray) -> float:
     return float(cv2.contourArea(points.astype("float32")))
 
 
+def _quad_area(points: List[Tuple[float, float]]) -> float:
+    """Shoelace area of a 4-point quad; half the cross product of its diagonals."""
+    (x0, y0), (x1, y1), (x2, y2), (x3, y3) = points
+    return 0.5 * abs((x0 - x2) * (y1 - y3) - (x1 - x3) * (y0 - y2))
+
+
+def _pack_quad(text: str, quad) -> QRCodeDetection:
+    """
+    Build a detection from an (N, 2) corner array or sequence of (x, y) pairs.
+
+    Arrays are converted with a single tolist(); for four corners plain float
+    arithmetic beats NumPy reductions, whose per-call overhead dominates.
+    """
+    if isinstance(quad, np.ndarray):
+        quad = quad.reshape(-1, 2).tolist()
+    points = [(float(x), float(y)) for x, y in quad]
+    if len(points) == 4:
+        (x0, y0), (x1, y1), (x2, y2), (x3, y3) = points
+        center = ((x0 + x1 + x2 + x3) / 4.0, (y0 + y1 + y2 + y3) / 4.0)
+        area = _quad_area(points)
+    else:
+        # zbar reports the convex hull, which can have more corners.
+        n = len(points)
+        center = (sum(p[0] for p in points) / n, sum(p[1] for p in points) / n)
+        area = _polygon_area(np.array(points))
+    return QRCodeDetection(text=text, points=points, center=center, area=area)
+
+
+# Every selectable backend, in the order --bench tries them.
+BACKENDS = ("pyzbar", "zxingcpp", "wechat", "opencv", "opencv_aruco")
+
+
+def _pyzbar_available() -> bool:
+    try:
+        from pyzbar import pyzbar  # type: ignore  # noqa: F401
+    except ImportError:
+        return False
+    return True
+
+
 class QRDetector:
-    def __init__(self, backend: str = "opencv"):
+    """
+    Decode QR codes in a frame with one of BACKENDS.
+
+    With max_side set, frames whose long edge is larger are shrunk to it
+    (INTER_AREA) before decoding, and the results are mapped back to frame
+    coordinates; decode cost scales with pixel count. 0 keeps full size.
+
+    With prefer_gray, BGR frames are converted to grayscale once up front,
+    before any resize, since every backend binarizes luminance anyway.
+    """
+
+    def __init__(
+        self, backend: str = "auto", max_side: int = 0, prefer_gray: bool = True
+    ):
+        if backend == "auto":
+            # zbar decodes both deck codes in one fast pass; OpenCV needs no
+            # extra install, so it is the fallback.
+            backend = "pyzbar" if _pyzbar_available() else "opencv"
         self.backend = backend
         self._opencv = None
         self._pyzbar = None
         self._zxingcpp = None
+        self._wechat = None
+        self.max_side = max_side
+        self.prefer_gray = prefer_gray
+        self._small = None
+        self._gray = None
 
         if backend == "pyzbar":
             try:
@@ -42,92 +104,105 @@ class QRDetector:
                     "zxing-cpp is not installed; pip install zxing-cpp"
                 ) from exc
             self._zxingcpp = zxingcpp
+        elif backend == "wechat":
+            # CNN detector from opencv-contrib; decodes every code in one pass.
+            if not hasattr(cv2, "wechat_qrcode_WeChatQRCode"):
+                raise RuntimeError(
+                    "WeChat QR needs OpenCV contrib; pip install opencv-contrib-python"
+                )
+            self._wechat = cv2.wechat_qrcode_WeChatQRCode()
         elif backend == "opencv_aruco":
             self._opencv = cv2.QRCodeDetectorAruco()
         else:
             self._opencv = cv2.QRCodeDetector()
 
     def detect(self, frame) -> List[QRCodeDetection]:
+        h, w = frame.shape[:2]
+        if self.prefer_gray and frame.ndim == 3:
+            gray = self._gray
+            if gray is None or gray.shape != (h, w):
+                gray = self._gray = np.empty((h, w), np.uint8)
+            frame = cv2.cvtColor(frame, cv2.COLOR_BGR2GRAY, dst=gray)
+        if not self.max_side or max(h, w) <= self.max_side:
+            return self._decode(frame)
+        scale = self.max_side / max(h, w)
+        size = (max(1, round(w * scale)), max(1, round(h * scale)))
+        shape = (size[1], size[0], *frame.shape[2:])
+        small = self._small
+        if small is None or small.shape != shape or small.dtype != frame.dtype:
+            small = self._small = np.empty(shape, frame.dtype)
+        cv2.resize(frame, size, dst=small, interpolation=cv2.INTER_AREA)
+        detections = self._decode(small)
+        sx, sy = w / size[0], h / size[1]
+        for det in detections:
+            det.points = [(x * sx, y * sy) for x, y in det.points]
+            det.center = (det.center[0] * sx, det.center[1] * sy)
+            det.area *= sx * sy
+        return detections
+
+    def detect_roi(
+        self, frame, cx: float, cy: float, side_px: float
+    ) -> List[QRCodeDetection]:
+        """Detect only in the side_px square around (cx, cy); frame coordinates."""
+        h, w = frame.shape[:2]
+        half = side_px / 2
+        x0 = max(0, int(cx - half))
+        y0 = max(0, int(cy - half))
+        x1 = min(w, int(cx + half) + 1)
+        y1 = min(h, int(cy + half) + 1)
+        if x1 <= x0 or y1 <= y0:
+            return []
+        detections = self.detect(frame[y0:y1, x0:x1])
+        for det in detections:
+            det.points = [(x + x0, y + y0) for x, y in det.points]
+            det.center = (det.center[0] + x0, det.center[1] + y0)
+        return detections
+
+    def _decode(self, frame) -> List[QRCodeDetection]:
         if self.backend == "pyzbar":
             return _detect_pyzbar(frame, self._pyzbar)
         if self.backend == "zxingcpp":
             return _detect_zxingcpp(frame, self._zxingcpp)
+        if self.backend == "wechat":
+            return _detect_wechat(frame, self._wechat)
         return _detect_opencv(frame, self._opencv)
 
 
 def _detect_opencv(frame, detector: cv2.QRCodeDetector) -> List[QRCodeDetection]:
-    detections: List[QRCodeDetection] = []
-
     ok, decoded_info, points, _ = detector.detectAndDecodeMulti(frame)
     if ok and decoded_info and points is not None:
-        for text, quad in zip(decoded_info, points):
-            if not text:
-                continue
-            quad_points = [(float(x), float(y)) for x, y in quad]
-            center_x = sum(p[0] for p in quad_points) / 4.0
-            center_y = sum(p[1] for p in quad_points) / 4.0
-            area = _polygon_area(np.array(quad_points))
-            detections.append(
-                QRCodeDetection(
-                    text=text,
-                    points=quad_points,
-                    center=(center_x, center_y),
-                    area=area,
-                )
-            )
-        return detections
+        return [
+            _pack_quad(text, quad) for text, quad in zip(decoded_info, points) if text
+        ]
     try:
         result = detector.detectAndDecode(frame)
     except cv2.error:
-        return detections
+        return []
     if len(result) == 3:
         text, points, _ = result
     else:
         text, points = result
     if text and points is not None:
-        quad_points = [(float(x), float(y)) for x, y in points[0]]
-        center_x = sum(p[0] for p in quad_points) / 4.0
-        center_y = sum(p[1] for p in quad_points) / 4.0
-        area = _polygon_area(np.array(quad_points))
-        detections.append(
-            QRCodeDetection(
-                text=text,
-                points=quad_points,
-                center=(center_x, center_y),
-                area=area,
-            )
-        )
-
-    return detections
+        return [_pack_quad(text, points[0])]
+    return []
 
 
 def _detect_pyzbar(frame, pyzbar) -> List[QRCodeDetection]:
     detections: List[QRCodeDetection] = []
-    gray = cv2.cvtColor(frame, cv2.COLOR_BGR2GRAY)
+    gray = frame if frame.ndim == 2 else cv2.cvtColor(frame, cv2.COLOR_BGR2GRAY)
     for obj in pyzbar.decode(gray):
         text = obj.data.decode("utf-8", errors="replace")
-        points = obj.polygon or []
-        if points:
-            quad_points = [(float(p.x), float(p.y)) for p in points]
+        if obj.polygon:
+            quad = [(p.x, p.y) for p in obj.polygon]
         else:
             rect = obj.rect
-            quad_points = [
-                (float(rect.left), float(rect.top)),
-                (float(rect.left + rect.width), float(rect.top)),
-                (float(rect.left + rect.width), float(rect.top + rect.height)),
-                (float(rect.left), float(rect.top + rect.height)),
+            quad = [
+                (rect.left, rect.top),
+                (rect.left + rect.width, rect.top),
+                (rect.left + rect.width, rect.top + rect.height),
+                (rect.left, rect.top + rect.height),
             ]
-        center_x = sum(p[0] for p in quad_points) / len(quad_points)
-        center_y = sum(p[1] for p in quad_points) / len(quad_points)
-        area = _polygon_area(np.array(quad_points))
-        detections.append(
-            QRCodeDetection(
-                text=text,
-                points=quad_points,
-                center=(center_x, center_y),
-                area=area,
-            )
-        )
+        detections.append(_pack_quad(text, quad))
     return detections
 
 
@@ -137,21 +212,16 @@ def _detect_zxingcpp(frame, zxingcpp) -> List[QRCodeDetection]:
         if not result.text:
             continue
         pos = result.position
-        quad_points = [
-            (float(pos.top_left.x), float(pos.top_left.y)),
-            (float(pos.top_right.x), float(pos.top_right.y)),
-            (float(pos.bottom_right.x), float(pos.bottom_right.y)),
-            (float(pos.bottom_left.x), float(pos.bottom_left.y)),
+        quad = [
+            (pos.top_left.x, pos.top_left.y),
+            (pos.top_right.x, pos.top_right.y),
+            (pos.bottom_right.x, pos.bottom_right.y),
+            (pos.bottom_left.x, pos.bottom_left.y),
         ]
-        center_x = sum(p[0] for p in quad_points) / 4.0
-        center_y = sum(p[1] for p in quad_points) / 4.0
-        area = _polygon_area(np.array(quad_points))
-        detections.append(
-            QRCodeDetection(
-                text=result.text,
-                points=quad_points,
-                center=(center_x, center_y),
-                area=area,
-            )
-        )
+        detections.append(_pack_quad(result.text, quad))
     return detections
+
+
+def _detect_wechat(frame, detector) -> List[QRCodeDetection]:
+    texts, points = detector.detectAndDecode(frame)
+    return [_pack_quad(text, quad) for text, quad in zip(texts, points) if text]
@@ -5,13 +5,46 @@ Prevents spurious triggers from transient QR detections by requiring
 a configurable stability period before firing events.
 """
 
-from dataclasses import dataclass
-from typing import Optional
+from enum import IntEnum
+from typing import NamedTuple, Optional, Sequence, Union
 
+import numpy as np
 
-@dataclass
-class SideState:
-    """Current state for one side (left or right) of the detection area."""
+from ._jit import HAVE_NUMBA, njit
+
+
+class Side(IntEnum):
+    """A side of the detection area; also its index into the tracker state."""
+
+    LEFT = 0
+    RIGHT = 1
+
+
+# Accepted side names at the API boundary, and the name for each side.
+_SIDE_MAP = {"left": Side.LEFT, "right": Side.RIGHT}
+_SIDE_NAMES = ("left", "right")
+
+# Columns of a side's state row, all integer monotonic nanoseconds. Deadlines
+# are fixed when the time they count from is written: the trigger deadline
+# is first_seen + stable, the dropout and forget deadlines last_seen plus
+# dropout and forget. Unset times are _UNSET; unset deadlines are _NEVER,
+# which no timestamp passes.
+_FIRST_SEEN = 0
+_TRIGGER_AT = 1
+_TRIGGERED = 2
+_LAST_SEEN = 3
+_DROPOUT_AT = 4
+_FORGET_AT = 5
+_UNSET = -1
+_NEVER = 2**63 - 1
+_NOT_SEEN = (_UNSET, _NEVER, 0, _UNSET, _NEVER, _NEVER)
+
+# Text id for "no text"; real texts are interned to ids 0, 1, ...
+_NO_TEXT = -1
+
+
+class SideState(NamedTuple):
+    """Snapshot of one side (left or right) of the detection area."""
 
     current_text: Optional[str] = None
     first_seen: Optional[float] = None
@@ -19,14 +52,117 @@ class SideState:
     triggered: bool = False
 
 
-@dataclass
-class TriggerEvent:
+class TriggerEvent(NamedTuple):
     """Event fired when a QR code detection becomes stable."""
 
     side: str  # "left" or "right"
     text: str  # QR code content
 
 
+@njit(cache=True)
+def _advance(
+    state,
+    current_id: int,
+    detected_id: int,
+    now: int,
+    stable: int,
+    dropout: int,
+    forget: int,
+) -> tuple[int, bool]:
+    """
+    Apply one detection (_NO_TEXT for nothing seen) to a side.
+
+    state is the side's state row, as an array row or a list of Python
+    ints, and is updated in place. All times are in ns.
+    Returns (current_id, fired).
+    """
+    first_seen, trigger_at, triggered, _, dropout_at, forget_at = state
+
+    # Steady state while a record sits on the deck: same code, already fired.
+    # After a dropout first_seen is unset and has to be restarted below, so
+    # that case takes the full path.
+    if detected_id == current_id and triggered and first_seen != _UNSET:
+        state[_LAST_SEEN:] = (now, now + dropout, now + forget)
+        return current_id, False
+
+    if detected_id == _NO_TEXT:
+        # Nothing to compute, only deadlines to compare; never-seen sides have
+        # _NEVER deadlines and fall through both.
+        if now > forget_at:
+            state[:] = _NOT_SEEN
+            return _NO_TEXT, False
+        if now > dropout_at:
+            state[_FIRST_SEEN] = _UNSET
+            state[_TRIGGER_AT] = _NEVER
+        return current_id, False
+
+    if current_id != detected_id:
+        state[:] = (now, now + stable, 0, now, now + dropout, now + forget)
+        return detected_id, False
+
+    state[_LAST_SEEN:] = (now, now + dropout, now + forget)
+    if first_seen == _UNSET:
+        state[_FIRST_SEEN] = now
+        state[_TRIGGER_AT] = now + stable
+        return current_id, False
+
+    if not triggered and now >= trigger_at:
+        state[_TRIGGERED] = 1
+        return current_id, True
+
+    return current_id, False
+
+
+# update() steps one side on a list row; a compiled call would cost more in
+# dispatch than the step itself.
+_advance_py = getattr(_advance, "py_func", _advance)
+
+# Below this many updates, dispatching into the compiled batch loop costs
+# more than stepping each one through update() (measured); the main loop
+# sends two.
+_COMPILED_BATCH_MIN = 6
+
+
+@njit(cache=True)
+def _advance_batch(
+    states,
+    text_ids,
+    sides,
+    detected_ids,
+    times,
+    stable,
+    dropout,
+    forget,
+    dedup,
+    fired,
+):
+    """
+    Run a batch through _advance; see StateTracker.update_batch.
+
+    states and text_ids hold every side's row and text id, as arrays (nested
+    lists without numba), and are updated in place; times and thresholds
+    are in ns. fired[k] is set for updates that fire.
+    """
+    for k in range(len(sides)):
+        i = sides[k]
+        state = states[i]
+        detected_id = detected_ids[k]
+        now = times[k]
+        if (
+            detected_id == text_ids[i]
+            and state[_TRIGGERED] != 0
+            and now - state[_LAST_SEEN] < dedup
+        ):
+            continue
+        text_ids[i], fired[k] = _advance(
+            state, text_ids[i], detected_id, now, stable, dropout, forget
+        )
+
+
+def _to_ns(seconds: float) -> int:
+    return round(seconds * 1e9)
+
+
 class StateTracker:
     """
     Tracks detection stability across left and right sides.
@@ -35,51 +171,165 @@ class StateTracker:
     - stable_seconds: How long a detection must persist before triggering
     - dropout_seconds: Max time without detection before resetting stability
     - forget_seconds: Max time without detection before clearing state entirely
+    - dedup_seconds: Repeats of an already-fired code within this long of the
+      last refresh are dropped on entry (0 disables; keep below dropout)
 
     This prevents accidental triggers from momentary QR code appearances.
+
+    Each side's state is an immutable (text id, row) pair, the row holding
+    its times, deadlines and the triggered flag, indexed by side. Updates
+    build the new pair and publish it with one assignment, so a reader on
+    another thread always sees a consistent side without locking; there is
+    one writer. Texts are interned on entry so the state is all numbers and
+    the hot comparison is between two ints. Times are kept as integer nanoseconds;
+    update() and update_batch() take seconds, update_left() and
+    update_right() take time.monotonic_ns() values directly.
     """
 
     def __init__(
-        self, stable_seconds: float, dropout_seconds: float, forget_seconds: float
+        self,
+        stable_seconds: float,
+        dropout_seconds: float,
+        forget_seconds: float,
+        dedup_seconds: float = 0.0,
     ):
         self.stable_seconds = stable_seconds
         self.dropout_seconds = dropout_seconds
         self.forget_seconds = forget_seconds
-        self.left = SideState()
-        self.right = SideState()
+        self.dedup_seconds = dedup_seconds
+        self._stable_ns = _to_ns(stable_seconds)
+        self._dropout_ns = _to_ns(dropout_seconds)
+        self._forget_ns = _to_ns(forget_seconds)
+        self._dedup_ns = _to_ns(dedup_seconds)
+        self._states = [(_NO_TEXT, _NOT_SEEN), (_NO_TEXT, _NOT_SEEN)]
+        self._intern: dict[str, int] = {}
+        self._text_by_id: list[str] = []
+        # Per-side update(), indexed by Side; no side dispatch inside.
+        self.update_left = self._side_updater(Side.LEFT)
+        self.update_right = self._side_updater(Side.RIGHT)
+        self._updaters = (self.update_left, self.update_right)
+
+    @property
+    def left(self) -> SideState:
+        return self._snapshot(0)
+
+    @property
+    def right(self) -> SideState:
+        return self._snapshot(1)
+
+    def _text_id(self, text: Optional[str]) -> int:
+        if text is None:
+            return _NO_TEXT
+        text_id = self._intern.get(text)
+        if text_id is None:
+            text_id = self._intern[text] = len(self._text_by_id)
+            self._text_by_id.append(text)
+        return text_id
+
+    def _snapshot(self, i: int) -> SideState:
+        text_id, (first_seen, _, triggered, last_seen, _, _) = self._states[i]
+        return SideState(
+            current_text=None if text_id == _NO_TEXT else self._text_by_id[text_id],
+            first_seen=None if first_seen == _UNSET else first_seen / 1e9,
+            last_seen=None if last_seen == _UNSET else last_seen / 1e9,
+            triggered=bool(triggered),
+        )
+
+    def _side_updater(self, i: Side):
+        """update() for one side, with its index, name and state list bound."""
+        name = _SIDE_NAMES[i]
+        states = self._states
+        intern = self._text_id
+
+        def update_side(
+            detected_text: Optional[str], now_ns: int
+        ) -> Optional[TriggerEvent]:
+            current_id, row = states[i]
+            detected_id = intern(detected_text)
+            # A repeat of the fired code soon after the last refresh changes
+            # nothing that matters; skip the step and the publish.
+            if (
+                detected_id == current_id
+                and row[_TRIGGERED]
+                and now_ns - row[_LAST_SEEN] < self._dedup_ns
+            ):
+                return None
+            state = list(row)
+            current_id, fired = _advance_py(
+                state,
+                current_id,
+                detected_id,
+                now_ns,
+                self._stable_ns,
+                self._dropout_ns,
+                self._forget_ns,
+            )
+            states[i] = (current_id, tuple(state))
+            return TriggerEvent(name, detected_text) if fired else None
+
+        return update_side
 
     def update(
-        self, side: str, detected_text: Optional[str], now: float
+        self, side: Union[Side, str], detected_text: Optional[str], now: float
     ) -> Optional[TriggerEvent]:
-        state = self.left if side == "left" else self.right
+        i = _SIDE_MAP[side] if isinstance(side, str) else side
+        return self._updaters[i](detected_text, _to_ns(now))
 
-        if detected_text is None:
-            if state.last_seen is None:
-                return None
-            time_since_seen = now - state.last_seen
-            if time_since_seen > self.forget_seconds:
-                state.current_text = None
-                state.first_seen = None
-                state.last_seen = None
-                state.triggered = False
-            elif time_since_seen > self.dropout_seconds:
-                state.first_seen = None
-            return None
-
-        if state.current_text != detected_text:
-            state.current_text = detected_text
-            state.first_seen = now
-            state.last_seen = now
-            state.triggered = False
-            return None
-
-        state.last_seen = now
-        if state.first_seen is None:
-            state.first_seen = now
-            return None
-
-        if not state.triggered and (now - state.first_seen) >= self.stable_seconds:
-            state.triggered = True
-            return TriggerEvent(side=side, text=detected_text)
-
-        return None
+    def update_batch(
+        self, sides, texts: Sequence[Optional[str]], times
+    ) -> list[TriggerEvent]:
+        """
+        Apply a batch of updates in order and return the events they fire.
+
+        sides holds Side values (or their ints) and times the matching
+        timestamps in seconds, as arrays or sequences. The loop over the
+        batch is compiled when numba is installed and runs on arrays copied
+        from the published state, otherwise on lists; either way each side
+        is published once at the end.
+        """
+        sides = np.asarray(sides).tolist()
+        times = np.rint(np.asarray(times, dtype=np.float64) * 1e9).astype(np.int64)
+        if HAVE_NUMBA and len(sides) < _COMPILED_BATCH_MIN:
+            updaters = self._updaters
+            events = [
+                updaters[i](text, now)
+                for i, text, now in zip(sides, texts, times.tolist())
+            ]
+            return [event for event in events if event is not None]
+        detected_ids = [self._text_id(text) for text in texts]
+        current = [text_id for text_id, _ in self._states]
+        states = [list(row) for _, row in self._states]
+        if HAVE_NUMBA:
+            current = np.array(current, dtype=np.int64)
+            states = np.array(states, dtype=np.int64)
+            batch = (
+                np.asarray(sides, dtype=np.intp),
+                np.asarray(detected_ids, dtype=np.int64),
+                times,
+            )
+            fired = np.zeros(len(sides), dtype=np.bool_)
+        else:
+            batch = (sides, detected_ids, times.tolist())
+            fired = [False] * len(sides)
+        _advance_batch(
+            states,
+            current,
+            *batch,
+            self._stable_ns,
+            self._dropout_ns,
+            self._forget_ns,
+            self._dedup_ns,
+            fired,
+        )
+        if HAVE_NUMBA:
+            current = current.tolist()
+            states = states.tolist()
+        for i, (text_id, state) in enumerate(zip(current, states)):
+            self._states[i] = (text_id, tuple(state))
+        if True not in fired:  # the usual frame
+            return []
+        return [
+            TriggerEvent(_SIDE_NAMES[i], text)
+            for i, text, hit in zip(sides, texts, fired)
+            if hit
+        ]